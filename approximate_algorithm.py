@@ -2,14 +2,25 @@
 approximate_algorithm.py (остаточно виправлена версія)
 
 Модуль реалізації наближеного (двоетапного) алгоритму розподілу ділянок
-між чотирма забудовниками з контролем відхилення вартості.
+між K забудовниками (за замовчуванням чотирма) з контролем відхилення
+вартості.
 """
 
 import time
 import math
 import random
+from array import array
 from collections import deque
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+from cost_state import CostState
+from grid import Grid, as_grid, seed_cells
+from priority_expansion import EXPANSION_STRATEGIES, PriorityExpander
+from random_source import RandomSource, make_rng
+from results import ApproximateResult
+from swap_index import SwapCandidateIndex, improving_swaps
+import numpy_backend
+
+BACKENDS = ("python", "numpy")
 
 
 def calculate_deviation(costs: Dict[int, float]) -> Tuple[float, float]:
@@ -24,261 +35,490 @@ def calculate_deviation(costs: Dict[int, float]) -> Tuple[float, float]:
     return stddev, max_dev
 
 
-def _is_border_cell(
-    assignment_matrix: List[List[int]], i: int, j: int, m: int, n: int
-) -> bool:
+def _is_border_cell(grid: Grid, owners: array, cell: int) -> bool:
     """Перевіряє, чи є клітинка на межі з іншими забудовниками."""
-    if assignment_matrix[i][j] == 0:
+    current_owner = owners[cell]
+    if current_owner == 0:
         return False
 
-    current_owner = assignment_matrix[i][j]
-    for di, dj in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-        ni, nj = i + di, j + dj
-        if (
-            0 <= ni < m
-            and 0 <= nj < n
-            and assignment_matrix[ni][nj] != 0
-            and assignment_matrix[ni][nj] != current_owner
-        ):
+    for offset in grid.offsets(cell):
+        neighbor_owner = owners[cell + offset]
+        if neighbor_owner != 0 and neighbor_owner != current_owner:
             return True
     return False
 
 
-def _find_border_cells(
-    assignment_matrix: List[List[int]], m: int, n: int
-) -> List[Tuple[int, int, int]]:
+def _find_border_cells(grid: Grid, owners: array) -> List[Tuple[int, int]]:
     """Знаходить всі клітинки на межі між забудовниками."""
     border_cells = []
-    for i in range(m):
-        for j in range(n):
-            if _is_border_cell(assignment_matrix, i, j, m, n):
-                border_cells.append((i, j, assignment_matrix[i][j]))
+    for cell in range(len(owners)):
+        if _is_border_cell(grid, owners, cell):
+            border_cells.append((cell, owners[cell]))
     return border_cells
 
 
-def _check_connectivity(
-    assignment_matrix: List[List[int]], owner: int, m: int, n: int
-) -> bool:
+def _check_connectivity(grid: Grid, owners: array, owner: int) -> bool:
     """Перевіряє зв'язність території для конкретного забудовника."""
-    cells = [
-        (x, y) for x in range(m) for y in range(n) if assignment_matrix[x][y] == owner
-    ]
+    cells = [cell for cell in range(len(owners)) if owners[cell] == owner]
 
     if len(cells) == 0:
         return True
 
-    visited = set()
+    visited = {cells[0]}
     queue = deque([cells[0]])
-    visited.add(cells[0])
 
     while queue:
-        x, y = queue.popleft()
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            nx, ny = x + dx, y + dy
-            if (
-                0 <= nx < m
-                and 0 <= ny < n
-                and (nx, ny) not in visited
-                and assignment_matrix[nx][ny] == owner
-            ):
-                visited.add((nx, ny))
-                queue.append((nx, ny))
+        cell = queue.popleft()
+        for offset in grid.offsets(cell):
+            neighbor = cell + offset
+            if neighbor not in visited and owners[neighbor] == owner:
+                visited.add(neighbor)
+                queue.append(neighbor)
 
     return len(visited) == len(cells)
 
 
+def _reconnects(grid: Grid, owners: array, targets: List[int], owner: int) -> bool:
+    """
+    Перевіряє пошуком у ширину, чи з'єднані всі клітинки targets у межах
+    території забудовника. Пошук зупиняється, щойно знайдено всі цілі.
+    """
+    remaining = set(targets[1:])
+    visited = {targets[0]}
+    queue = deque([targets[0]])
+
+    while queue and remaining:
+        cell = queue.popleft()
+        for offset in grid.offsets(cell):
+            neighbor = cell + offset
+            if neighbor not in visited and owners[neighbor] == owner:
+                visited.add(neighbor)
+                remaining.discard(neighbor)
+                queue.append(neighbor)
+
+    return not remaining
+
+
+def _removal_keeps_connectivity(
+    grid: Grid, owners: array, cell: int, owner: int, backend: str = "python"
+) -> bool:
+    """
+    Перевіряє, чи залишиться територія забудовника зв'язною без клітинки cell.
+
+    Територія до вилучення вважається зв'язною (цей інваріант підтримують
+    обидва етапи алгоритму). Тоді досить з'ясувати, чи з'єднані між собою
+    сусіди клітинки по стороні. Спершу виконується локальна перевірка на
+    кільці з восьми сусідів: якщо всі сусіди по стороні лежать в одній
+    неперервній дузі кільця, вони з'єднані через кутові клітинки. Лише у
+    неоднозначних випадках виконується обмежений пошук у ширину.
+    """
+    ring = grid.ring_offsets[grid.cell_class[cell]]
+    in_ring = [offset is not None and owners[cell + offset] == owner for offset in ring]
+
+    # Сусіди по стороні стоять у кільці на непарних позиціях
+    side_neighbors = [cell + ring[k] for k in range(1, 8, 2) if in_ring[k]]
+    if len(side_neighbors) <= 1:
+        return True
+
+    # Рахуємо неперервні дуги кільця, що містять хоча б одного сусіда по стороні
+    if all(in_ring):
+        return True
+    start = in_ring.index(False)
+    arcs = 0
+    arc_has_side = False
+    for step in range(1, 9):
+        k = (start + step) % 8
+        if in_ring[k]:
+            arc_has_side = arc_has_side or k % 2 == 1
+        else:
+            if arc_has_side:
+                arcs += 1
+            arc_has_side = False
+
+    if arcs <= 1:
+        return True
+    if backend == "numpy":
+        return numpy_backend.reconnects(grid, owners, side_neighbors, owner)
+    return _reconnects(grid, owners, side_neighbors, owner)
+
+
 def _can_transfer_cell(
-    assignment_matrix: List[List[int]], i: int, j: int, new_owner: int, m: int, n: int
+    grid: Grid, owners: array, cell: int, new_owner: int, backend: str = "python"
 ) -> bool:
     """Перевіряє, чи можна передати клітинку без порушення зв'язності."""
-    old_owner = assignment_matrix[i][j]
-    assignment_matrix[i][j] = new_owner
+    old_owner = owners[cell]
+    owners[cell] = new_owner
+    check_connectivity = (
+        numpy_backend.check_connectivity if backend == "numpy" else _check_connectivity
+    )
 
-    # Перевіряємо зв'язність для обох забудовників
-    old_connected = _check_connectivity(assignment_matrix, old_owner, m, n)
-    new_connected = _check_connectivity(assignment_matrix, new_owner, m, n)
+    # Перевіряємо зв'язність для обох забудовників. Нова територія зв'язна,
+    # якщо клітинка прилягає до неї; інакше виконується повна перевірка.
+    old_connected = _removal_keeps_connectivity(grid, owners, cell, old_owner, backend)
+    new_connected = old_connected and (
+        any(owners[cell + offset] == new_owner for offset in grid.offsets(cell))
+        or check_connectivity(grid, owners, new_owner)
+    )
 
     is_valid = old_connected and new_connected
     if not is_valid:
-        assignment_matrix[i][j] = old_owner  # Відновлюємо
+        owners[cell] = old_owner  # Відновлюємо
 
     return is_valid
 
 
-def _get_neighbors(
-    assignment_matrix: List[List[int]],
-    i: int,
-    j: int,
-    current_owner: int,
-    m: int,
-    n: int,
-) -> set:
+def _get_neighbors(grid: Grid, owners: array, cell: int, current_owner: int) -> set:
     """Знаходить сусідніх забудовників для клітинки."""
     neighbors = set()
-    for di, dj in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-        ni, nj = i + di, j + dj
-        if (
-            0 <= ni < m
-            and 0 <= nj < n
-            and assignment_matrix[ni][nj] != 0
-            and assignment_matrix[ni][nj] != current_owner
-        ):
-            neighbors.add(assignment_matrix[ni][nj])
+    for offset in grid.offsets(cell):
+        owner = owners[cell + offset]
+        if owner != 0 and owner != current_owner:
+            neighbors.add(owner)
     return neighbors
 
 
 def _try_local_improvement(
-    assignment_matrix: List[List[int]],
-    total_costs: Dict[int, int],
-    matrix: List[List[int]],
-    i: int,
-    j: int,
+    grid: Grid,
+    owners: array,
+    cost_state: CostState,
+    cell: int,
     current_owner: int,
-    m: int,
-    n: int,
+    backend: str = "python",
+    swap_index: Optional[SwapCandidateIndex] = None,
 ) -> bool:
     """Намагається покращити розподіл для конкретної клітинки."""
-    current_cost = matrix[i][j]
-    current_max_dev = max(total_costs.values()) - min(total_costs.values())
-    neighbors = _get_neighbors(assignment_matrix, i, j, current_owner, m, n)
+    current_cost = grid.costs[cell]
+    current_max_dev = cost_state.max_dev()
+    neighbors = _get_neighbors(grid, owners, cell, current_owner)
 
     for new_owner in neighbors:
         # Перевіряємо покращення балансу
-        temp_costs = total_costs.copy()
-        temp_costs[current_owner] -= current_cost
-        temp_costs[new_owner] += current_cost
-        new_max_dev = max(temp_costs.values()) - min(temp_costs.values())
+        new_max_dev = cost_state.max_dev_after_transfer(
+            current_owner, new_owner, current_cost
+        )
 
         if new_max_dev < current_max_dev and _can_transfer_cell(
-            assignment_matrix, i, j, new_owner, m, n
+            grid, owners, cell, new_owner, backend
         ):
             # Здійснюємо передачу
-            total_costs[current_owner] -= current_cost
-            total_costs[new_owner] += current_cost
+            cost_state.transfer(current_owner, new_owner, current_cost)
+            if swap_index is not None:
+                swap_index.update_around(cell)
             return True
     return False
 
 
+def _try_swap(
+    grid: Grid,
+    owners: array,
+    cost_state: CostState,
+    swap_index: SwapCandidateIndex,
+    cell: int,
+    current_owner: int,
+    backend: str = "python",
+) -> bool:
+    """
+    Намагається покращити розподіл обміном клітинки з клітинкою сусіднього
+    забудовника так, щоб обидві території залишилися зв'язними.
+    """
+    neighbors = _get_neighbors(grid, owners, cell, current_owner)
+
+    for _, partner, new_owner, amount in improving_swaps(
+        swap_index, cost_state, cell, neighbors
+    ):
+        if not _can_transfer_cell(grid, owners, cell, new_owner, backend):
+            continue
+        if _can_transfer_cell(grid, owners, partner, current_owner, backend):
+            cost_state.transfer(current_owner, new_owner, amount)
+            swap_index.update_around(cell)
+            swap_index.update_around(partner)
+            return True
+        owners[cell] = current_owner  # Відновлюємо
+    return False
+
+
 def _local_optimization_step(
-    assignment_matrix: List[List[int]],
-    total_costs: Dict[int, int],
-    matrix: List[List[int]],
-    m: int,
-    n: int,
+    grid: Grid,
+    owners: array,
+    cost_state: CostState,
+    rng: random.Random,
+    backend: str = "python",
+    swap_index: Optional[SwapCandidateIndex] = None,
 ) -> bool:
-    """Виконує один крок локальної оптимізації."""
-    border_cells = _find_border_cells(assignment_matrix, m, n)
-    random.shuffle(border_cells)
+    """
+    Виконує один крок локальної оптимізації. Якщо задано swap_index і
+    жодна передача клітинки не покращує розподіл, шукається обмін.
+    """
+    if backend == "numpy":
+        border_cells = numpy_backend.find_border_cells(grid, owners)
+    else:
+        border_cells = _find_border_cells(grid, owners)
+    rng.shuffle(border_cells)
 
-    for i, j, current_owner in border_cells:
+    for cell, current_owner in border_cells:
         if _try_local_improvement(
-            assignment_matrix, total_costs, matrix, i, j, current_owner, m, n
+            grid, owners, cost_state, cell, current_owner, backend, swap_index
         ):
             return True
+
+    if swap_index is not None:
+        for cell, current_owner in border_cells:
+            if _try_swap(
+                grid, owners, cost_state, swap_index, cell, current_owner, backend
+            ):
+                return True
     return False
 
 
 def _expand_developer(
     dev_id: int,
     frontier: deque,
-    assignment_matrix: List[List[int]],
-    total_costs: Dict[int, int],
-    developers_area: Dict[int, List[Tuple[int, int]]],
-    matrix: List[List[int]],
-    m: int,
-    n: int,
+    grid: Grid,
+    owners: array,
+    cost_state: CostState,
+    developers_area: Dict[int, List[int]],
 ) -> bool:
     """Виконує одне розширення території для одного забудовника."""
     if not frontier:
         return False
 
-    x, y = frontier.popleft()
-    for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < m and 0 <= ny < n and assignment_matrix[nx][ny] == 0:
-            assignment_matrix[nx][ny] = dev_id
-            total_costs[dev_id] += matrix[nx][ny]
-            developers_area[dev_id].append((nx, ny))
-            frontier.append((nx, ny))
+    cell = frontier.popleft()
+    for offset in grid.offsets(cell):
+        neighbor = cell + offset
+        if owners[neighbor] == 0:
+            owners[neighbor] = dev_id
+            cost_state.add(dev_id, grid.costs[neighbor])
+            developers_area[dev_id].append(neighbor)
+            frontier.append(neighbor)
             return True
     return False
 
 
 def _expand_all(
-    assignment_matrix: List[List[int]],
-    total_costs: Dict[int, int],
-    developers_area: Dict[int, List[Tuple[int, int]]],
+    grid: Grid,
+    owners: array,
+    cost_state: CostState,
+    developers_area: Dict[int, List[int]],
     frontier: Dict[int, deque],
-    matrix: List[List[int]],
-    m: int,
-    n: int,
 ) -> bool:
     """Розширює території всіх забудовників у поточній ітерації."""
     moved = False
-    for dev_id in range(1, 5):
+    for dev_id in range(1, cost_state.num_owners + 1):
         if _expand_developer(
             dev_id,
             frontier[dev_id],
-            assignment_matrix,
-            total_costs,
+            grid,
+            owners,
+            cost_state,
             developers_area,
-            matrix,
-            m,
-            n,
         ):
             moved = True
     return moved
 
 
+def _run_expansion_phase(
+    grid: Grid,
+    owners: array,
+    cost_state: CostState,
+    developers_area: Dict[int, List[int]],
+    frontier: Dict[int, deque],
+    max_expansion_iterations: int,
+) -> int:
+    """
+    Розширює території, поки є куди, і повертає кількість ітерацій.
+
+    Черга FIFO відкидає клітинку фронту після першого ж розширення з неї,
+    тож за початкових клітинок не в кутах можуть лишитися нічийні кишені.
+    Такі клітинки добираються пріоритетним розширенням.
+    """
+    expansion_iterations = 0
+    while expansion_iterations < max_expansion_iterations:
+        moved = _expand_all(grid, owners, cost_state, developers_area, frontier)
+        if not moved:
+            assigned = sum(len(area) for area in developers_area.values())
+            if assigned < len(owners):
+                expansion_iterations += _run_priority_expansion(
+                    grid,
+                    owners,
+                    cost_state,
+                    developers_area,
+                    max_expansion_iterations - expansion_iterations,
+                )
+            break
+        expansion_iterations += 1
+    return expansion_iterations
+
+
+def _run_priority_expansion(
+    grid: Grid,
+    owners: array,
+    cost_state: CostState,
+    developers_area: Dict[int, List[int]],
+    max_expansion_iterations: int,
+) -> int:
+    """
+    Пріоритетне розширення (PriorityExpander): за ітерацію приєднується
+    стільки клітинок, скільки забудовників, кожна — до території
+    забудовника з найменшими витратами. Повертає кількість ітерацій.
+    """
+    expander = PriorityExpander(grid, owners, cost_state)
+    expansion_iterations = 0
+    while expansion_iterations < max_expansion_iterations:
+        moved = False
+        for _ in range(cost_state.num_owners):
+            cell = expander.step()
+            if cell is None:
+                break
+            developers_area[owners[cell]].append(cell)
+            moved = True
+        if not moved:
+            break
+        expansion_iterations += 1
+    return expansion_iterations
+
+
 def _initialize_algorithm(
-    matrix: List[List[int]], m: int, n: int
-) -> Tuple[
-    Dict[int, List[Tuple[int, int]]], Dict[int, int], List[List[int]], Dict[int, deque]
-]:
-    """Ініціалізує початковий стан алгоритму."""
-    developers_area = {i: [] for i in range(1, 5)}
-    total_costs = {i: 0 for i in range(1, 5)}
-    assignment_matrix = [[0] * n for _ in range(m)]
-
-    # ЕТАП 1: Початковий розподіл кутів
-    corners = [(0, 0), (0, n - 1), (m - 1, 0), (m - 1, n - 1)]
-    for dev_id, (x, y) in enumerate(corners, start=1):
-        developers_area[dev_id].append((x, y))
-        total_costs[dev_id] += matrix[x][y]
-        assignment_matrix[x][y] = dev_id
-
-    frontier = {i: deque(developers_area[i]) for i in range(1, 5)}
-    return developers_area, total_costs, assignment_matrix, frontier
+    grid: Grid, seeds: Sequence[int]
+) -> Tuple[Dict[int, List[int]], CostState, array, Dict[int, deque]]:
+    """
+    Ініціалізує початковий стан алгоритму: забудовник k (1..K) отримує
+    клітинку seeds[k - 1].
+    """
+    num_owners = len(seeds)
+    developers_area: Dict[int, List[int]] = {i: [] for i in range(1, num_owners + 1)}
+    cost_state = CostState(num_owners)
+    owners = grid.new_owners()
+
+    # ЕТАП 1: Початковий розподіл стартових клітинок
+    for dev_id, cell in enumerate(seeds, start=1):
+        developers_area[dev_id].append(cell)
+        cost_state.add(dev_id, grid.costs[cell])
+        owners[cell] = dev_id
+
+    frontier = {i: deque(developers_area[i]) for i in range(1, num_owners + 1)}
+    return developers_area, cost_state, owners, frontier
+
+
+def _initialize_from_assignment(
+    grid: Grid,
+    assignment: Sequence[Sequence[int]],
+    num_owners: int,
+    backend: str = "python",
+) -> Tuple[CostState, array]:
+    """
+    Будує стан алгоритму з готового розподілу (теплий старт) за один прохід
+    по матриці: масив власників, сумарні витрати та перевірку зв'язності.
+    З backend "numpy" сумарні витрати обчислюються np.bincount. Нічийні
+    клітинки (0) допускаються — їх добирає етап розширення.
+
+    Викидає:
+        ValueError: Якщо розмір розподілу не збігається з матрицею, власник
+            клітинки не є 0 чи одним із забудовників 1..num_owners або
+            територія забудовника незв'язна.
+    """
+    m, n = grid.m, grid.n
+    if len(assignment) != m or any(len(row) != n for row in assignment):
+        raise ValueError("Розмір початкового розподілу не відповідає матриці.")
+
+    owners = grid.new_owners()
+    cost_state = CostState(num_owners)
+    costs = grid.costs
+    vectorized = backend == "numpy"
+    cell = 0
+    for row in assignment:
+        for owner in row:
+            if not 0 <= owner <= num_owners:
+                raise ValueError(
+                    f"Клітинка {grid.coords(cell)} має недопустимого власника {owner}."
+                )
+            owners[cell] = owner
+            if owner != 0 and not vectorized:
+                cost_state.add(owner, costs[cell])
+            cell += 1
+    if vectorized:
+        totals = numpy_backend.owner_totals(grid, owners, num_owners)
+        for owner in range(1, num_owners + 1):
+            cost_state.add(owner, totals[owner])
+
+    # Кожна територія має складатися з однієї компоненти зв'язності
+    visited = bytearray(len(owners))
+    seen = set()
+    for start, owner in enumerate(owners):
+        if visited[start] or owner == 0:
+            continue
+        if owner in seen:
+            raise ValueError(f"Територія забудовника {owner} незв'язна.")
+        seen.add(owner)
+        visited[start] = 1
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            for offset in grid.offsets(cell):
+                neighbor = cell + offset
+                if not visited[neighbor] and owners[neighbor] == owner:
+                    visited[neighbor] = 1
+                    queue.append(neighbor)
+
+    return cost_state, owners
 
 
 def _run_optimization_phase(
-    assignment_matrix: List[List[int]],
-    total_costs: Dict[int, int],
-    matrix: List[List[int]],
-    m: int,
-    n: int,
+    grid: Grid,
+    owners: array,
+    cost_state: CostState,
     max_iterations: int,
     stability_threshold: int,
     local_search_type: str,
+    rng: random.Random,
+    backend: str = "python",
+    deadline: Optional[float] = None,
+    on_improvement: Optional[Callable[[], None]] = None,
+    stop_at_local_optimum: bool = False,
 ) -> Tuple[int, int]:
-    """Запускає фазу локальної оптимізації."""
+    """
+    Запускає фазу локальної оптимізації.
+
+    Якщо задано deadline (момент часу за time.perf_counter), фаза триває до
+    нього замість обмежень max_iterations та stability_threshold і
+    завершується раніше, якщо досягнуто локального оптимуму (жодна межова
+    клітинка не покращує розподіл). З stop_at_local_optimum фаза так само
+    завершується на локальному оптимумі й без deadline: крок без переходу
+    не змінює стану, тож наступні кроки теж нічого не змінять. Функція
+    on_improvement викликається після кожного прийнятого перенесення клітинки.
+    """
     optimization_iterations = 0
     stagnant_iters = 0
     prev_max_dev = float("inf")
+    swap_index = None
+    if local_search_type == "3":
+        swap_index = SwapCandidateIndex(grid, owners)
+        swap_index.rebuild()
 
     while (
-        optimization_iterations < max_iterations
+        time.perf_counter() < deadline
+        if deadline is not None
+        else optimization_iterations < max_iterations
         and stagnant_iters < stability_threshold
     ):
 
         # Використовуємо local_search_type для контролю кількості спроб за ітерацію
         attempts = 2 if local_search_type == "2" else 1
 
+        moved = False
         for _ in range(attempts):
-            if _local_optimization_step(assignment_matrix, total_costs, matrix, m, n):
+            if _local_optimization_step(
+                grid, owners, cost_state, rng, backend, swap_index
+            ):
+                moved = True
                 break
 
-        _, max_dev = calculate_deviation(total_costs)
+        if moved and on_improvement is not None:
+            on_improvement()
+        elif not moved and (deadline is not None or stop_at_local_optimum):
+            optimization_iterations += 1
+            break
+
+        max_dev = cost_state.max_dev()
 
         if max_dev >= prev_max_dev:
             stagnant_iters += 1
@@ -292,69 +532,152 @@ def _run_optimization_phase(
 
 
 def approximate_algorithm(
-    matrix: List[List[int]],
+    matrix: Union[Grid, List[List[int]]],
     m: int,
     n: int,
     max_iterations: int,
     stability_threshold: int,
     local_search_type: str,
-) -> Dict[str, object]:
+    backend: str = "python",
+    rng: RandomSource = None,
+    time_budget_ms: Optional[float] = None,
+    progress: Optional[Callable[[float, int], None]] = None,
+    expansion_strategy: str = "fifo",
+    num_developers: int = 4,
+    seeds: Optional[Sequence[Tuple[int, int]]] = None,
+    initial_assignment: Optional[Sequence[Sequence[int]]] = None,
+) -> ApproximateResult:
     """
-    Наближений двоетапний алгоритм розподілу ділянок між чотирма забудовниками.
+    Наближений двоетапний алгоритм розподілу ділянок між num_developers
+    забудовниками.
+
+    Функція нічого не виводить; текстовий звіт формує
+    reporting.format_approximate_result.
+
+    Матриця вартостей може бути передана як Grid або як список списків
+    (тоді вона перетворюється у Grid). Параметр backend обирає реалізацію
+    повних проходів по матриці (пошук межових клітинок, перевірка
+    зв'язності): "python" або векторизовану "numpy" з тим самим результатом.
+    Параметр rng задає джерело випадковості (random.Random,
+    numpy.random.Generator або ціле зерно); з однаковим зерном результат
+    відтворюється.
+
+    Забудовник k починає з клітинки seeds[k - 1] (пари (рядок, стовпець));
+    за замовчуванням — кути матриці для K ≤ 4 і рівномірна решітка для
+    більшої кількості (див. grid.default_seeds).
+
+    Параметр initial_assignment задає теплий старт: готовий розподіл m×n
+    (номери забудовників 1..num_developers, наприклад матриця попереднього
+    результату). Розподіл один раз перевіряється на зв'язність (ValueError,
+    якщо він некоректний); нічийні клітинки (0) добираються пріоритетним
+    розширенням (PriorityExpander) від заданих територій, інакше етап
+    розширення пропускається. Оптимізація завершується, щойно досягнуто
+    локального оптимуму.
+
+    Тип локального пошуку local_search_type: "1" — одна спроба покращення
+    за ітерацію, "2" — дві, "3" — як "1", але якщо жодна передача клітинки
+    не покращує розподіл, шукається обмін двома клітинками між сусідніми
+    забудовниками (SwapCandidateIndex).
+
+    Параметр expansion_strategy обирає стратегію етапу розширення: "fifo" —
+    забудовники по черзі приєднують першу вільну сусідню клітинку,
+    "priority" — розширюється забудовник з найменшими витратами, обираючи
+    найдешевшу клітинку найближчого шару свого фронту (PriorityExpander).
+
+    Якщо задано time_budget_ms, розширення виконується до завершення (без
+    обмеження max_iterations // 2), а оптимізація триває до вичерпання бюджету часу
+    (max_iterations та stability_threshold тоді не обмежують роботу) або до
+    локального оптимуму. Кожне прийняте перенесення строго зменшує
+    максимальне відхилення, тож поточний розподіл завжди є найкращим із
+    знайдених. Функція progress(elapsed, max_dev) викликається після
+    розширення та після кожного покращення; elapsed — секунди від початку.
     """
+    if backend not in BACKENDS:
+        raise ValueError(f"Невідомий backend: {backend}")
+    if expansion_strategy not in EXPANSION_STRATEGIES:
+        raise ValueError(f"Невідома стратегія розширення: {expansion_strategy}")
+
     start_time = time.time()
+    started = time.perf_counter()
+    deadline = None if time_budget_ms is None else started + time_budget_ms / 1000
+    rng = make_rng(rng)
 
     # Ініціалізація
-    developers_area, total_costs, assignment_matrix, frontier = _initialize_algorithm(
-        matrix, m, n
-    )
-
-    # ЕТАП 2: Розширення територій
-    expansion_iterations = 0
-    max_expansion_iterations = max_iterations // 2
+    grid = as_grid(matrix, m, n)
+    if initial_assignment is not None:
+        # Теплий старт: етап розширення пропускається
+        cost_state, owners = _initialize_from_assignment(
+            grid, initial_assignment, num_developers, backend
+        )
+        # Нічийні клітинки (розширення попереднього запуску зупинилося на
+        # max_iterations // 2) добираються пріоритетним розширенням
+        expansion_iterations = 0
+        if 0 in owners:
+            expansion_iterations = _run_priority_expansion(
+                grid,
+                owners,
+                cost_state,
+                {owner: [] for owner in range(1, num_developers + 1)},
+                grid.m * grid.n,
+            )
+    else:
+        developers_area, cost_state, owners, frontier = _initialize_algorithm(
+            grid, seed_cells(grid, num_developers, seeds)
+        )
 
-    while expansion_iterations < max_expansion_iterations:
-        moved = _expand_all(
-            assignment_matrix, total_costs, developers_area, frontier, matrix, m, n
+        # ЕТАП 2: Розширення територій
+        max_expansion_iterations = (
+            max_iterations // 2 if deadline is None else grid.m * grid.n
         )
-        if not moved:
-            break
-        expansion_iterations += 1
+        if expansion_strategy == "priority":
+            expansion_iterations = _run_priority_expansion(
+                grid, owners, cost_state, developers_area, max_expansion_iterations
+            )
+        else:
+            expansion_iterations = _run_expansion_phase(
+                grid,
+                owners,
+                cost_state,
+                developers_area,
+                frontier,
+                max_expansion_iterations,
+            )
+
+    def report() -> None:
+        progress(time.perf_counter() - started, cost_state.max_dev())
+
+    if progress is not None:
+        report()
 
     # ЕТАП 3: Локальна оптимізація
     remaining_iterations = max_iterations - expansion_iterations
     optimization_iterations, _ = _run_optimization_phase(
-        assignment_matrix,
-        total_costs,
-        matrix,
-        m,
-        n,
+        grid,
+        owners,
+        cost_state,
         remaining_iterations,
         stability_threshold,
         local_search_type,
+        rng,
+        backend,
+        deadline,
+        report if progress is not None else None,
+        initial_assignment is not None,
     )
 
     total_iterations = expansion_iterations + optimization_iterations
     exec_time = time.time() - start_time
-    avg_dev, max_dev = calculate_deviation(total_costs)
-
-    print("\n=== Наближений двоетапний алгоритм ===")
-    print("\nМатриця розподілу:")
-    for row in assignment_matrix:
-        print(" ".join(str(cell) for cell in row))
-
-    print(f"\nКількість ітерацій (розширення): {expansion_iterations}")
-    print(f"Кількість ітерацій (оптимізація): {optimization_iterations}")
-    print(f"Загальна кількість ітерацій: {total_iterations}")
-    print(f"Час виконання: {exec_time:.4f} секунд")
-    print(f"Загальна вартість для кожного забудовника: {total_costs}")
-    print(f"Якість рішень (відхилення від середньої цільової вартості): {max_dev}")
+    avg_dev, max_dev = cost_state.stddev(), cost_state.max_dev()
+    assignment_matrix = grid.to_matrix(owners)
+    total_costs = cost_state.as_dict()
 
     return {
         "matrix": assignment_matrix,
         "total_costs": total_costs,
         "execution_time": exec_time,
         "iterations": total_iterations,
+        "expansion_iterations": expansion_iterations,
+        "optimization_iterations": optimization_iterations,
         "avg_dev": avg_dev,
         "max_dev": max_dev,
     }
@@ -0,0 +1,350 @@
+"""
+batch_runner.py
+
+Пакетний (неінтерактивний) режим: розв'язує задачу для набору файлів
+матриць без меню та введення з консолі. Файли задаються шляхами, теками
+або шаблонами glob, обробляються паралельно у пулі процесів, а для кожного
+файлу виводиться один рядок результату у форматі JSON Lines або CSV.
+
+Приклади:
+    python batch_runner.py data/ --solvers greedy approximate --workers 4
+    python batch_runner.py "data/*.bin" --format csv --output results.csv
+    python main.py data/*.txt --max-iterations 2000 --seed 7
+"""
+
+import argparse
+import contextlib
+import csv
+import glob
+import io
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from approximate_algorithm import BACKENDS, approximate_algorithm
+from exhaustive_search import (
+    EXHAUSTIVE_TIME_BUDGET_MS,
+    MAX_EXHAUSTIVE_CELLS,
+    NUM_OWNERS,
+    SEARCH_MODES,
+    exhaustive_search,
+)
+from greedy_algorithm import greedy_algorithm
+from grid import Grid
+from helper_functions import load_grid
+from priority_expansion import EXPANSION_STRATEGIES
+
+SOLVER_NAMES = ("greedy", "approximate", "exhaustive")
+
+# Поля результату кожного алгоритму, що потрапляють у вихідний рядок
+SOLVER_FIELDS: Dict[str, Sequence[str]] = {
+    "greedy": ("max_dev", "total_costs", "iterations", "execution_time"),
+    "approximate": (
+        "max_dev",
+        "avg_dev",
+        "total_costs",
+        "iterations",
+        "execution_time",
+    ),
+    "exhaustive": ("max_deviation", "total_costs", "execution_time"),
+}
+
+
+def expand_inputs(patterns: Sequence[str]) -> List[str]:
+    """
+    Перетворює шляхи, теки та шаблони glob у відсортований список файлів
+    без повторів. Для теки беруться всі файли безпосередньо в ній.
+    """
+    files = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for name in os.listdir(pattern):
+                path = os.path.join(pattern, name)
+                if os.path.isfile(path):
+                    files.add(path)
+        else:
+            files.update(path for path in glob.glob(pattern) if os.path.isfile(path))
+    return sorted(files)
+
+
+def instance_seed(base_seed: int, path: str) -> int:
+    """
+    Зерно генератора для файлу: залежить лише від базового зерна та шляху,
+    а не від порядку обробки чи кількості процесів.
+    """
+    return random.Random(f"{base_seed}:{path}").randrange(2**32)
+
+
+def solve_file(path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Розв'язує задачу для одного файлу обраними алгоритмами.
+
+    Повертає:
+        Плоский словник результату: 'file', 'm', 'n', 'status' ("ok" або
+        "error"), 'error' та поля SOLVER_FIELDS з префіксом назви алгоритму
+        (None, якщо алгоритм не запускався або завершився помилкою). Якщо
+        файл не вдалося зчитати або алгоритм викинув виняток, status —
+        "error", а 'error' містить повідомлення (для алгоритмів — з
+        префіксом назви, через «; »).
+    """
+    record: Dict[str, Any] = {
+        "file": path,
+        "m": None,
+        "n": None,
+        "status": "ok",
+        "error": None,
+    }
+    for solver in options["solvers"]:
+        for field in SOLVER_FIELDS[solver]:
+            record[f"{solver}_{field}"] = None
+        if options["include_matrix"]:
+            record[f"{solver}_matrix"] = None
+
+    # Завантажувач повідомляє про помилку у stdout; у пакетному режимі
+    # повідомлення потрапляє у поле 'error' рядка результату
+    messages = io.StringIO()
+    with contextlib.redirect_stdout(messages):
+        grid = load_grid(path)
+    if grid is None:
+        record["status"] = "error"
+        record["error"] = messages.getvalue().strip() or "Не вдалося зчитати файл."
+        return record
+
+    record["m"], record["n"] = grid.m, grid.n
+    seed = instance_seed(options["seed"], path)
+
+    # Помилка алгоритму (некоректні параметри для цього файлу, перевищення
+    # бюджету часу) записується в рядок результату файлу й не зупиняє ні
+    # інші алгоритми, ні решту пакета
+    errors = []
+    for solver in options["solvers"]:
+        try:
+            result = _run_solver(solver, grid, options, seed)
+        except Exception as exc:
+            errors.append(f"{solver}: {exc}")
+            continue
+        if result is None:
+            continue
+
+        for field in SOLVER_FIELDS[solver]:
+            record[f"{solver}_{field}"] = result[field]
+        if options["include_matrix"]:
+            record[f"{solver}_matrix"] = result["matrix"]
+
+    if errors:
+        record["status"] = "error"
+        record["error"] = "; ".join(errors)
+    return record
+
+
+def _run_solver(
+    solver: str, grid: Grid, options: Dict[str, Any], seed: int
+) -> Optional[Dict[str, Any]]:
+    """
+    Запускає алгоритм solver для матриці grid. Повертає None, якщо повний
+    перебір пропущено через розмір матриці.
+    """
+    if solver == "greedy":
+        return greedy_algorithm(
+            grid,
+            grid.m,
+            grid.n,
+            max_iterations=options["max_iterations"],
+            stability_threshold=options["stability_threshold"],
+            local_search_type=options["local_search_type"],
+            expansion_strategy=options["expansion_strategy"],
+            num_developers=options["developers"],
+            seeds=options["seeds"],
+            rng=seed,
+        )
+    if solver == "approximate":
+        return approximate_algorithm(
+            grid,
+            grid.m,
+            grid.n,
+            max_iterations=options["max_iterations"],
+            stability_threshold=options["stability_threshold"],
+            local_search_type=options["local_search_type"],
+            backend=options["backend"],
+            expansion_strategy=options["expansion_strategy"],
+            num_developers=options["developers"],
+            seeds=options["seeds"],
+            rng=seed,
+        )
+    if grid.m * grid.n > options["max_exhaustive_cells"]:
+        return None
+    return exhaustive_search(
+        grid,
+        grid.m,
+        grid.n,
+        mode=options["exhaustive_mode"],
+        num_owners=options["exhaustive_owners"],
+        time_budget_ms=options["exhaustive_time_budget_ms"],
+    )
+
+
+def _solve_job(job: tuple) -> Dict[str, Any]:
+    """Обгортка solve_file для пулу процесів."""
+    path, options = job
+    return solve_file(path, options)
+
+
+def run_batch(
+    paths: Sequence[str], options: Dict[str, Any], workers: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Обробляє файли paths і повертає результати у порядку файлів у міру
+    їх отримання. За workers == 1 файли обробляються у поточному процесі.
+    """
+    jobs = [(path, options) for path in paths]
+    workers = min(workers or os.cpu_count() or 1, max(len(jobs), 1))
+
+    if workers == 1:
+        for job in jobs:
+            yield _solve_job(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_solve_job, jobs, chunksize=4)
+
+
+def _parse_seed(value: str) -> Tuple[int, int]:
+    """Розбирає початкову клітинку у форматі «рядок,стовпець»."""
+    try:
+        i, j = (int(part) for part in value.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"очікується «рядок,стовпець», отримано {value!r}"
+        ) from None
+    return i, j
+
+
+def _csv_value(value: Any) -> Any:
+    """Подає значення для CSV: списки та словники записуються як JSON."""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return "" if value is None else value
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Розбирає аргументи командного рядка пакетного режиму."""
+    parser = argparse.ArgumentParser(
+        description="Пакетний розв'язок задачі розподілу для набору файлів матриць"
+    )
+    parser.add_argument(
+        "inputs", nargs="+", help="файли, теки або шаблони glob з матрицями"
+    )
+    parser.add_argument(
+        "--solvers", nargs="+", choices=SOLVER_NAMES, default=list(SOLVER_NAMES)
+    )
+    parser.add_argument("--max-iterations", type=int, default=1000)
+    parser.add_argument("--stability-threshold", type=int, default=50)
+    parser.add_argument("--local-search-type", choices=("1", "2", "3"), default="1")
+    parser.add_argument("--backend", choices=BACKENDS, default="python")
+    parser.add_argument(
+        "--expansion-strategy", choices=EXPANSION_STRATEGIES, default="fifo"
+    )
+    parser.add_argument(
+        "--developers",
+        type=int,
+        default=4,
+        help="кількість забудовників для жадібного та наближеного алгоритмів",
+    )
+    parser.add_argument(
+        "--seeds",
+        nargs="+",
+        type=_parse_seed,
+        metavar="I,J",
+        help="початкові клітинки забудовників (за замовчуванням — кути або решітка)",
+    )
+    parser.add_argument(
+        "--exhaustive-mode", choices=SEARCH_MODES, default="branch_and_bound"
+    )
+    parser.add_argument(
+        "--exhaustive-owners",
+        type=int,
+        default=NUM_OWNERS,
+        help="кількість забудовників для повного перебору",
+    )
+    parser.add_argument(
+        "--max-exhaustive-cells",
+        type=int,
+        default=MAX_EXHAUSTIVE_CELLS,
+        help="повний перебір лише для матриць із не більшою кількістю клітинок",
+    )
+    parser.add_argument(
+        "--exhaustive-time-budget-ms",
+        type=float,
+        default=EXHAUSTIVE_TIME_BUDGET_MS,
+        help="бюджет часу повного перебору для одного файлу, мс",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="базове зерно")
+    parser.add_argument("--workers", type=int, help="кількість процесів")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--output", help="файл результатів (за замовчуванням stdout)")
+    parser.add_argument(
+        "--include-matrix",
+        action="store_true",
+        help="додавати матриці розподілу до результатів",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Точка входу пакетного режиму. Повертає код завершення: 0, якщо всі
+    файли оброблено без помилок, 1 — якщо хоча б один файл не вдалося
+    зчитати або хоча б один алгоритм завершився помилкою (рядок результату
+    зі status "error"), 2 — якщо не знайдено жодного файлу.
+    """
+    args = parse_args(argv)
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("Не знайдено жодного файлу матриці.", file=sys.stderr)
+        return 2
+
+    options = {
+        "solvers": list(dict.fromkeys(args.solvers)),
+        "max_iterations": args.max_iterations,
+        "stability_threshold": args.stability_threshold,
+        "local_search_type": args.local_search_type,
+        "backend": args.backend,
+        "expansion_strategy": args.expansion_strategy,
+        "developers": args.developers,
+        "seeds": args.seeds,
+        "exhaustive_mode": args.exhaustive_mode,
+        "exhaustive_owners": args.exhaustive_owners,
+        "max_exhaustive_cells": args.max_exhaustive_cells,
+        "exhaustive_time_budget_ms": args.exhaustive_time_budget_ms,
+        "seed": args.seed,
+        "include_matrix": args.include_matrix,
+    }
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else None
+    stream = out or sys.stdout
+    failed = 0
+    try:
+        writer = None
+        for record in run_batch(paths, options, args.workers):
+            if record["status"] != "ok":
+                failed += 1
+            if args.format == "csv":
+                if writer is None:
+                    writer = csv.DictWriter(stream, fieldnames=list(record))
+                    writer.writeheader()
+                writer.writerow({k: _csv_value(v) for k, v in record.items()})
+            else:
+                stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            stream.flush()
+    finally:
+        if out is not None:
+            out.close()
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+"""
+benchmark.py
+
+Набір бенчмарків для трьох алгоритмів розподілу: жадібного, наближеного та
+повного перебору (гілки та межі). Для кожного розміру матриці алгоритми
+запускаються на фіксованому наборі випадкових матриць із заданим зерном:
+спершу прогрівальні запуски, далі повторні вимірювання через
+time.perf_counter та окремий запуск під tracemalloc для пікової пам'яті.
+
+Результат (операцій за секунду, перцентилі затримки, пікова пам'ять)
+записується у JSON, а режим --compare порівнює його з попереднім
+результатом і повідомляє про регресії.
+
+Приклади:
+    python benchmark.py --output baseline.json
+    python benchmark.py --solvers greedy approximate --sizes 3 10 50
+    python benchmark.py --output current.json --compare baseline.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from approximate_algorithm import approximate_algorithm
+from exhaustive_search import exhaustive_search
+from experiment_engine import aggregate
+from greedy_algorithm import greedy_algorithm
+from grid import Grid
+from parallel_exhaustive import exhaustive_search_parallel
+
+HEURISTIC_SIZES = (3, 5, 10, 20, 50, 100, 200, 500)
+# Повний перебір виконується лише для матриць до 10×10 (див. main.py)
+EXHAUSTIVE_SIZES = (3, 4, 5, 6, 7, 8, 9, 10)
+
+MAX_ITERATIONS = 1000
+STABILITY_THRESHOLD = 50
+LOCAL_SEARCH_TYPE = "1"
+
+
+def _run_greedy(grid: Grid, seed: int) -> Dict[str, Any]:
+    return greedy_algorithm(
+        grid,
+        grid.m,
+        grid.n,
+        max_iterations=MAX_ITERATIONS,
+        stability_threshold=STABILITY_THRESHOLD,
+        local_search_type=LOCAL_SEARCH_TYPE,
+        rng=seed,
+    )
+
+
+def _run_approximate(grid: Grid, seed: int) -> Dict[str, Any]:
+    return approximate_algorithm(
+        grid,
+        grid.m,
+        grid.n,
+        max_iterations=MAX_ITERATIONS,
+        stability_threshold=STABILITY_THRESHOLD,
+        local_search_type=LOCAL_SEARCH_TYPE,
+        rng=seed,
+    )
+
+
+def _run_exhaustive(grid: Grid, seed: int) -> Dict[str, Any]:
+    return exhaustive_search(grid, grid.m, grid.n, mode="branch_and_bound")
+
+
+def _run_exhaustive_parallel(grid: Grid, seed: int) -> Dict[str, Any]:
+    return exhaustive_search_parallel(grid, grid.m, grid.n)
+
+
+SOLVERS: Dict[str, Callable[[Grid, int], Dict[str, Any]]] = {
+    "greedy": _run_greedy,
+    "approximate": _run_approximate,
+    "exhaustive": _run_exhaustive,
+    "exhaustive_parallel": _run_exhaustive_parallel,
+}
+
+DEFAULT_SIZES: Dict[str, Sequence[int]] = {
+    "greedy": HEURISTIC_SIZES,
+    "approximate": HEURISTIC_SIZES,
+    "exhaustive": EXHAUSTIVE_SIZES,
+    "exhaustive_parallel": EXHAUSTIVE_SIZES,
+}
+
+
+def make_instances(size: int, count: int, seed: int, max_cost: int) -> List[Grid]:
+    """
+    Створює набір із count випадкових матриць size×size. Матриці залежать лише
+    від зерна, розміру та номера матриці, тож однакові між версіями коду.
+    """
+    instances = []
+    for index in range(count):
+        rng = random.Random(f"{seed}:{size}:{index}")
+        costs = array("i", (rng.randint(1, max_cost) for _ in range(size * size)))
+        instances.append(Grid(size, size, costs))
+    return instances
+
+
+def _instance_seed(seed: int, size: int, index: int) -> int:
+    """Зерно генератора алгоритму для конкретної матриці набору."""
+    return random.Random(f"run:{seed}:{size}:{index}").randrange(2**32)
+
+
+def _timed_run(
+    solver: Callable[[Grid, int], Dict[str, Any]], grid: Grid, seed: int
+) -> float:
+    """Виконує один запуск алгоритму й повертає його тривалість у секундах."""
+    start = time.perf_counter()
+    solver(grid, seed)
+    return time.perf_counter() - start
+
+
+def _peak_memory(
+    solver: Callable[[Grid, int], Dict[str, Any]], grid: Grid, seed: int
+) -> int:
+    """Вимірює пікову пам'ять (у байтах), виділену під час одного запуску."""
+    tracemalloc.start()
+    try:
+        solver(grid, seed)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def benchmark_solver(
+    name: str,
+    size: int,
+    instances: List[Grid],
+    seed: int,
+    warmup: int,
+    repeats: int,
+    measure_memory: bool = True,
+) -> Dict[str, Any]:
+    """
+    Вимірює алгоритм name на наборі матриць одного розміру.
+
+    Повертає:
+        Словник із ключами 'solver', 'size', 'runs', 'ops_per_sec',
+        'latency' (статистика тривалості запуску в секундах) та
+        'peak_memory_bytes' (максимум за набором або None).
+    """
+    solver = SOLVERS[name]
+    latencies = []
+    peak_memory: Optional[int] = 0 if measure_memory else None
+
+    for index, grid in enumerate(instances):
+        run_seed = _instance_seed(seed, size, index)
+        for _ in range(warmup):
+            _timed_run(solver, grid, run_seed)
+        for _ in range(repeats):
+            latencies.append(_timed_run(solver, grid, run_seed))
+        if measure_memory:
+            peak_memory = max(peak_memory, _peak_memory(solver, grid, run_seed))
+
+    latency = aggregate(latencies)
+    return {
+        "solver": name,
+        "size": size,
+        "runs": len(latencies),
+        "ops_per_sec": 1.0 / latency["mean"] if latency["mean"] > 0 else float("inf"),
+        "latency": latency,
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def run_suite(
+    solvers: Sequence[str],
+    sizes: Optional[Sequence[int]] = None,
+    instances: int = 3,
+    warmup: int = 1,
+    repeats: int = 5,
+    seed: int = 0,
+    max_cost: int = 100,
+    measure_memory: bool = True,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Виконує бенчмарки для обраних алгоритмів.
+
+    Якщо sizes не задано, для кожного алгоритму використовуються його
+    розміри за замовчуванням (DEFAULT_SIZES). Функція progress, якщо задана,
+    викликається з кожним отриманим записом.
+    """
+    results = []
+    for name in solvers:
+        for size in sizes if sizes is not None else DEFAULT_SIZES[name]:
+            grids = make_instances(size, instances, seed, max_cost)
+            record = benchmark_solver(
+                name, size, grids, seed, warmup, repeats, measure_memory
+            )
+            results.append(record)
+            if progress is not None:
+                progress(record)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seed": seed,
+            "instances": instances,
+            "warmup": warmup,
+            "repeats": repeats,
+            "max_cost": max_cost,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1
+) -> List[Dict[str, Any]]:
+    """
+    Порівнює два результати бенчмарків. Регресією вважається зростання
+    медіанної затримки (p50) або пікової пам'яті більш ніж на частку
+    threshold для пари (алгоритм, розмір), присутньої в обох результатах.
+    """
+    previous = {(r["solver"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for record in current["results"]:
+        old = previous.get((record["solver"], record["size"]))
+        if old is None:
+            continue
+        metrics = [("p50", old["latency"]["p50"], record["latency"]["p50"])]
+        if old["peak_memory_bytes"] and record["peak_memory_bytes"] is not None:
+            metrics.append(
+                (
+                    "peak_memory_bytes",
+                    old["peak_memory_bytes"],
+                    record["peak_memory_bytes"],
+                )
+            )
+        for metric, before, after in metrics:
+            if before > 0 and after > before * (1 + threshold):
+                regressions.append(
+                    {
+                        "solver": record["solver"],
+                        "size": record["size"],
+                        "metric": metric,
+                        "baseline": before,
+                        "current": after,
+                        "ratio": after / before,
+                    }
+                )
+    return regressions
+
+
+def _print_record(record: Dict[str, Any]) -> None:
+    """Виводить короткий рядок про отриманий запис у потік помилок."""
+    memory = record["peak_memory_bytes"]
+    memory_text = f"{memory / 1024:.1f} КіБ" if memory is not None else "—"
+    print(
+        f"{record['solver']:>12} {record['size']:>4}×{record['size']:<4}"
+        f" {record['ops_per_sec']:10.2f} оп/с"
+        f"  p50 {record['latency']['p50'] * 1000:9.3f} мс"
+        f"  p95 {record['latency']['p95'] * 1000:9.3f} мс"
+        f"  пам'ять {memory_text}",
+        file=sys.stderr,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Точка входу командного рядка. Повертає код завершення."""
+    parser = argparse.ArgumentParser(description="Бенчмарки алгоритмів розподілу")
+    parser.add_argument(
+        "--solvers", nargs="+", choices=sorted(SOLVERS), default=list(SOLVERS)
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, help="розміри квадратних матриць"
+    )
+    parser.add_argument("--instances", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-cost", type=int, default=100)
+    parser.add_argument(
+        "--no-memory", action="store_true", help="не вимірювати пікову пам'ять"
+    )
+    parser.add_argument("--output", help="файл для JSON (за замовчуванням stdout)")
+    parser.add_argument("--compare", help="JSON попереднього запуску для порівняння")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="допустиме відносне погіршення (0.1 = 10%%)",
+    )
+    args = parser.parse_args(argv)
+
+    report = run_suite(
+        args.solvers,
+        sizes=args.sizes,
+        instances=args.instances,
+        warmup=args.warmup,
+        repeats=args.repeats,
+        seed=args.seed,
+        max_cost=args.max_cost,
+        measure_memory=not args.no_memory,
+        progress=_print_record,
+    )
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+        report["regressions"] = compare(baseline, report, args.threshold)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+    regressions = report.get("regressions", [])
+    for item in regressions:
+        print(
+            f"Регресія: {item['solver']} {item['size']}×{item['size']} "
+            f"{item['metric']} {item['baseline']:.6g} → {item['current']:.6g} "
+            f"(×{item['ratio']:.2f})",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
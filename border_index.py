@@ -0,0 +1,104 @@
+"""
+border_index.py
+
+Модуль з індексом межових клітинок — клітинок, що мають сусіда з іншим
+забудовником. Індекс оновлюється локально після кожного перепризначення
+клітинки й дозволяє вибирати випадкову межову клітинку за O(1).
+"""
+
+import random
+from array import array
+from typing import Dict, Iterator, List
+
+from grid import Grid
+import numpy_backend
+
+
+class BorderCellIndex:
+    """
+    Підтримувана множина межових клітинок розподілу.
+
+    Клітинки (плоскі індекси Grid) зберігаються у списку (для випадкової
+    вибірки) та у словнику позицій (для видалення за O(1) заміною на
+    останній елемент).
+
+    Методи:
+        update_around(cell): Оновлює стан клітинки та її сусідів.
+        rebuild(): Повністю перебудовує індекс проходом по матриці.
+        random_cell(rng): Повертає випадкову межову клітинку.
+    """
+
+    def __init__(self, grid: Grid, owners: array):
+        self.grid = grid
+        self.owners = owners
+        self._cells: List[int] = []
+        self._positions: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._cells)
+
+    def __contains__(self, cell: int) -> bool:
+        return cell in self._positions
+
+    def _is_border(self, cell: int) -> bool:
+        """Перевіряє, чи має клітинка сусідів з іншими забудовниками."""
+        owners = self.owners
+        owner = owners[cell]
+        if owner == 0:
+            return False
+
+        for offset in self.grid.offsets(cell):
+            if owners[cell + offset] not in (0, owner):
+                return True
+        return False
+
+    def _refresh(self, cell: int) -> None:
+        """Додає або видаляє клітинку відповідно до її поточного стану."""
+        is_border = self._is_border(cell)
+        position = self._positions.get(cell)
+
+        if is_border and position is None:
+            self._positions[cell] = len(self._cells)
+            self._cells.append(cell)
+        elif not is_border and position is not None:
+            last = self._cells.pop()
+            if last != cell:
+                self._cells[position] = last
+                self._positions[last] = position
+            del self._positions[cell]
+
+    def update_around(self, cell: int) -> None:
+        """
+        Оновлює індекс після зміни власника клітинки.
+
+        Змінитися може лише стан самої клітинки та її чотирьох сусідів.
+        """
+        self._refresh(cell)
+        for offset in self.grid.offsets(cell):
+            self._refresh(cell + offset)
+
+    def rebuild(self, backend: str = "python") -> None:
+        """
+        Повністю перебудовує індекс за поточним розподілом.
+
+        Аргументи:
+            backend: "python" — перевірка кожної клітинки,
+                "numpy" — векторизований пошук межових клітинок.
+        """
+        self._cells.clear()
+        self._positions.clear()
+        if backend == "numpy":
+            for cell, _ in numpy_backend.find_border_cells(self.grid, self.owners):
+                self._positions[cell] = len(self._cells)
+                self._cells.append(cell)
+            return
+
+        for cell in range(len(self.owners)):
+            self._refresh(cell)
+
+    def random_cell(self, rng: random.Random) -> int:
+        """Повертає випадкову межову клітинку (індекс не має бути порожнім)."""
+        return rng.choice(self._cells)
@@ -0,0 +1,289 @@
+"""
+buffered_logger.py
+
+Буферизований асинхронний журнал для дублювання виводу у консоль та у
+лог-файл. Записи потрапляють в обмежену чергу й виводяться фоновим потоком
+пакетами, тож потік обчислень не чекає на введення-виведення. Підтримуються
+рівні деталізації окремо для консолі та файлу і ротація лог-файлів за
+розміром.
+"""
+
+import os
+import queue
+import sys
+import threading
+from typing import List, Optional
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+# Службові записи черги: скидання буферів та завершення фонового потоку
+_FLUSH = object()
+_STOP = object()
+# Скільки секунд чекати на місце в заповненій черзі для запису в консоль та
+# як часто перевіряти фоновий потік під час очікування
+_PUT_TIMEOUT = 0.5
+_POLL_INTERVAL = 0.5
+
+
+class BufferedLogger:
+    """
+    Файлоподібний об'єкт, що дублює вивід у консоль та в лог-файл через
+    фоновий потік.
+
+    Аргументи:
+        filename: Шлях до лог-файлу.
+        console_level: Мінімальний рівень записів, що виводяться у консоль.
+        file_level: Мінімальний рівень записів, що записуються у файл.
+        max_bytes: Розмір файлу в байтах, після якого виконується ротація
+            (0 — без ротації).
+        backup_count: Кількість збережених старих файлів (filename.1, ...).
+        queue_size: Розмір черги записів. Якщо черга заповнена, запис для
+            консолі чекає на місце до _PUT_TIMEOUT секунд, а потім
+            виводиться в консоль напряму (у файл він не потрапляє); записи
+            лише для файлу відкидаються. Кількість записів, втрачених хоча
+            б для одного виводу, зберігається в атрибуті dropped і
+            повідомляється під час flush() та close().
+
+    Методи:
+        write(message): Додає запис рівня INFO до черги.
+        log_message(message, level): Додає запис заданого рівня до черги.
+        stream(level): Повертає файлоподібний об'єкт для записів рівня level.
+        flush(): Чекає, доки всі записи буде виведено; викидає
+            RuntimeError, якщо фоновий потік завершився з помилкою.
+        close(): Виводить решту записів і закриває лог-файл.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        console_level: int = INFO,
+        file_level: int = DEBUG,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 3,
+        queue_size: int = 10000,
+    ):
+        self.terminal = sys.__stdout__
+        self.filename = filename
+        self.console_level = console_level
+        self.file_level = file_level
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.dropped = 0
+        self._reported_dropped = 0
+        self.closed = False
+        self._error: Optional[BaseException] = None
+
+        self.log = open(filename, "w", encoding="utf-8")
+        self._log_size = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(
+            target=self._run, name="buffered-logger", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, message: str) -> int:
+        """Додає рядок до черги з рівнем INFO без очікування виводу."""
+        return self.log_message(message, INFO)
+
+    def log_message(self, message: str, level: int = INFO) -> int:
+        """
+        Додає рядок заданого рівня до черги. Якщо черга заповнена, запис для
+        консолі коротко чекає на місце, а потім виводиться в консоль напряму;
+        запис лише для файлу відкидається, щоб не блокувати потік, що
+        викликає. Якщо фоновий потік завершився, записи для консолі
+        виводяться напряму.
+        """
+        if self.closed or not message:
+            return len(message)
+        to_console = level >= self.console_level
+        if not to_console and level < self.file_level:
+            return len(message)
+        if not self._thread.is_alive():
+            self._write_directly(message, to_console)
+            return len(message)
+        try:
+            self._queue.put_nowait((level, message))
+        except queue.Full:
+            if to_console:
+                try:
+                    self._queue.put((level, message), timeout=_PUT_TIMEOUT)
+                    return len(message)
+                except queue.Full:
+                    pass
+            self._write_directly(message, to_console)
+        return len(message)
+
+    def _write_directly(self, message: str, to_console: bool) -> None:
+        """
+        Виводить запис у консоль в обхід черги (якщо він для консолі) і
+        враховує його як втрачений для файлу або взагалі.
+        """
+        if to_console:
+            self.terminal.write(message)
+            self.terminal.flush()
+        self.dropped += 1
+
+    def _put_waiting(self, item: tuple) -> None:
+        """
+        Додає службовий запис до черги, чекаючи на місце, доки фоновий потік
+        працює.
+        """
+        while True:
+            self._check_thread()
+            try:
+                self._queue.put(item, timeout=_POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def _check_thread(self) -> None:
+        """Викидає RuntimeError, якщо фоновий потік більше не працює."""
+        if not self._thread.is_alive():
+            raise RuntimeError(
+                "Фоновий потік журналу завершився; записи не виводяться."
+            ) from self._error
+
+    def _dropped_notice(self) -> Optional[str]:
+        """Повідомлення про записи, втрачені після попереднього повідомлення."""
+        new = self.dropped - self._reported_dropped
+        if not new:
+            return None
+        self._reported_dropped = self.dropped
+        return f"\n[Пропущено записів через переповнення: {new}]\n"
+
+    def stream(self, level: int) -> "_LevelStream":
+        """Повертає файлоподібний об'єкт, що пише записи рівня level."""
+        return _LevelStream(self, level)
+
+    def flush(self) -> None:
+        """
+        Чекає, доки фоновий потік виведе всі записи, додані до виклику,
+        та скине буфери консолі й файлу (потрібно, наприклад, перед input()).
+        """
+        if self.closed:
+            return
+        notice = self._dropped_notice()
+        if notice is not None:
+            self._put_waiting((WARNING, notice))
+        done = threading.Event()
+        self._put_waiting((_FLUSH, done))
+        while not done.wait(_POLL_INTERVAL):
+            self._check_thread()
+
+    def close(self) -> None:
+        """Виводить решту записів, зупиняє фоновий потік і закриває файл."""
+        if self.closed:
+            return
+        if self._thread.is_alive():
+            self._put_waiting((_STOP, None))
+            self._thread.join()
+        self.closed = True
+        notice = self._dropped_notice()
+        if notice is not None:
+            self.terminal.write(notice)
+            self.terminal.flush()
+            self.log.write(notice)
+        self.log.close()
+
+    def isatty(self) -> bool:
+        return False
+
+    def writable(self) -> bool:
+        return True
+
+    def _run(self) -> None:
+        """
+        Цикл фонового потоку. Помилка виводу зберігається, щоб flush()
+        повідомив про неї замість нескінченного очікування.
+        """
+        try:
+            self._process()
+        except BaseException as exc:
+            self._error = exc
+            raise
+
+    def _process(self) -> None:
+        """Збирає записи з черги пакетами та виводить їх до службового _STOP."""
+        while True:
+            batch = [self._queue.get()]
+            # Забираємо все, що вже накопичилося, щоб вивести одним пакетом
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            console: List[str] = []
+            logged: List[str] = []
+            stop = False
+            for level, message in batch:
+                if level is _FLUSH or level is _STOP:
+                    self._emit(console, logged)
+                    console, logged = [], []
+                    self.terminal.flush()
+                    self.log.flush()
+                    if level is _STOP:
+                        stop = True
+                        break
+                    message.set()
+                    continue
+                if level >= self.console_level:
+                    console.append(message)
+                if level >= self.file_level:
+                    logged.append(message)
+
+            if stop:
+                return
+            self._emit(console, logged)
+            self.terminal.flush()
+
+    def _emit(self, console: List[str], logged: List[str]) -> None:
+        """Записує пакет у консоль та у файл, виконуючи ротацію за потреби."""
+        if console:
+            self.terminal.write("".join(console))
+        if logged:
+            text = "".join(logged)
+            size = len(text.encode("utf-8"))
+            if (
+                self.max_bytes
+                and self._log_size
+                and (self._log_size + size > self.max_bytes)
+            ):
+                self._rotate()
+            self.log.write(text)
+            self._log_size += size
+
+    def _rotate(self) -> None:
+        """Зсуває старі лог-файли (filename.1, filename.2, ...) і відкриває новий."""
+        self.log.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.filename}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.filename}.{index + 1}")
+            os.replace(self.filename, f"{self.filename}.1")
+        self.log = open(self.filename, "w", encoding="utf-8")
+        self._log_size = 0
+
+
+class _LevelStream:
+    """Файлоподібна обгортка BufferedLogger із фіксованим рівнем записів."""
+
+    def __init__(self, logger: BufferedLogger, level: int):
+        self.logger = logger
+        self.level = level
+
+    def write(self, message: str) -> int:
+        return self.logger.log_message(message, self.level)
+
+    def flush(self) -> None:
+        self.logger.flush()
+
+    def isatty(self) -> bool:
+        return False
+
+    def writable(self) -> bool:
+        return True
@@ -0,0 +1,130 @@
+"""
+cost_state.py
+
+Модуль зі станом сумарних витрат забудовників. Суми зберігаються в масиві
+фіксованого розміру разом із порядком забудовників за витратами та сумою
+квадратів, що дозволяє оцінювати передачу клітинки за O(1) без створення
+тимчасових словників.
+"""
+
+import math
+from array import array
+from typing import Dict
+
+
+class CostState:
+    """
+    Сумарні витрати забудовників 1..num_owners.
+
+    Атрибути:
+        costs: Масив витрат, індекс відповідає номеру забудовника
+            (елемент 0 не використовується — це «нічийні» клітинки).
+        total: Загальна сума витрат усіх забудовників.
+        sum_squares: Сума квадратів витрат забудовників.
+
+    Методи:
+        add(owner, amount): Додає вартість клітинки забудовнику.
+        transfer(src, dst, amount): Передає вартість клітинки між забудовниками.
+        max_dev(): Поточна різниця між найбільшими та найменшими витратами.
+        stddev(): Поточне середнє квадратичне відхилення витрат.
+        max_dev_after_transfer(src, dst, amount): Оцінка max_dev після передачі.
+        stddev_after_transfer(src, dst, amount): Оцінка stddev після передачі.
+        as_dict(): Витрати у вигляді словника {забудовник: сума}.
+        copy(): Незалежна копія стану.
+    """
+
+    def __init__(self, num_owners: int):
+        self.num_owners = num_owners
+        self.costs = array("q", [0] * (num_owners + 1))
+        self.total = 0
+        self.sum_squares = 0
+        # Забудовники, впорядковані за зростанням витрат
+        self._order = list(range(1, num_owners + 1))
+
+    def __getitem__(self, owner: int) -> int:
+        return self.costs[owner]
+
+    def _reorder(self, owner: int) -> None:
+        """Відновлює впорядкованість після зміни витрат одного забудовника."""
+        order = self._order
+        costs = self.costs
+        pos = order.index(owner)
+        value = costs[owner]
+        while pos > 0 and costs[order[pos - 1]] > value:
+            order[pos] = order[pos - 1]
+            pos -= 1
+        while pos < len(order) - 1 and costs[order[pos + 1]] < value:
+            order[pos] = order[pos + 1]
+            pos += 1
+        order[pos] = owner
+
+    def add(self, owner: int, amount: int) -> None:
+        """Додає вартість amount до витрат забудовника owner."""
+        old = self.costs[owner]
+        self.costs[owner] = old + amount
+        self.total += amount
+        self.sum_squares += amount * (2 * old + amount)
+        self._reorder(owner)
+
+    def transfer(self, src: int, dst: int, amount: int) -> None:
+        """Передає вартість amount від забудовника src до забудовника dst."""
+        self.add(src, -amount)
+        self.add(dst, amount)
+
+    def max_dev(self) -> int:
+        """Повертає різницю між найбільшими та найменшими витратами."""
+        return self.costs[self._order[-1]] - self.costs[self._order[0]]
+
+    def _stddev_from(self, sum_squares: int) -> float:
+        """Обчислює середнє квадратичне відхилення за сумою квадратів."""
+        k = self.num_owners
+        return math.sqrt(max(k * sum_squares - self.total * self.total, 0)) / k
+
+    def stddev(self) -> float:
+        """Повертає середнє квадратичне відхилення витрат."""
+        return self._stddev_from(self.sum_squares)
+
+    def max_dev_after_transfer(self, src: int, dst: int, amount: int) -> int:
+        """
+        Оцінює різницю між найбільшими та найменшими витратами після передачі
+        вартості amount від src до dst, не змінюючи стану.
+        """
+        costs = self.costs
+        new_src = costs[src] - amount
+        new_dst = costs[dst] + amount
+        high = max(new_src, new_dst)
+        low = min(new_src, new_dst)
+
+        # Серед решти забудовників досить знайти крайніх у впорядкуванні
+        for owner in reversed(self._order):
+            if owner != src and owner != dst:
+                high = max(high, costs[owner])
+                break
+        for owner in self._order:
+            if owner != src and owner != dst:
+                low = min(low, costs[owner])
+                break
+        return high - low
+
+    def stddev_after_transfer(self, src: int, dst: int, amount: int) -> float:
+        """
+        Оцінює середнє квадратичне відхилення після передачі вартості amount
+        від src до dst, не змінюючи стану.
+        """
+        old_src = self.costs[src]
+        old_dst = self.costs[dst]
+        delta = amount * (2 * (old_dst - old_src) + 2 * amount)
+        return self._stddev_from(self.sum_squares + delta)
+
+    def copy(self) -> "CostState":
+        """Повертає незалежну копію стану (за O(num_owners))."""
+        clone = CostState(self.num_owners)
+        clone.costs = array("q", self.costs)
+        clone.total = self.total
+        clone.sum_squares = self.sum_squares
+        clone._order = list(self._order)
+        return clone
+
+    def as_dict(self) -> Dict[int, int]:
+        """Повертає витрати у вигляді словника {забудовник: сума}."""
+        return {owner: self.costs[owner] for owner in range(1, self.num_owners + 1)}
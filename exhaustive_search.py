@@ -1,92 +1,481 @@
 """
 exhaustive_search.py
 
-Модуль для повного перебору всіх можливих розподілів клітинок між трьома забудовниками.
+Модуль для повного перебору всіх можливих розподілів клітинок між K забудовниками
+(за замовчуванням трьома) та точного розв'язання задачі для трьох забудовників
+динамічним програмуванням за сумами забудовників.
 """
 
 import time
-import copy
+from typing import Any, Optional, Sequence, Union
 
+from grid import Grid, as_grid
+from results import ExhaustiveResult
 
-def exhaustive_search(matrix: list[list[int]], m: int, n: int) -> dict:
+NUM_OWNERS = 3
+SEARCH_MODES = ("full", "branch_and_bound")
+# Обмеження запуску повного перебору з меню та в пакетному режимі: не більше
+# MAX_EXHAUSTIVE_CELLS клітинок і не довше за бюджет часу — метод гілок і
+# меж експоненційний у найгіршому випадку (зокрема на великих вартостях)
+MAX_EXHAUSTIVE_CELLS = 100
+EXHAUSTIVE_TIME_BUDGET_MS = 30_000
+# Найбільша кількість станів, що запам'ятовуються як безперспективні
+MAX_FAILED_STATES = 1 << 20
+# Як часто (у вузлах чи кроках перебору) перевіряється бюджет часу
+_DEADLINE_CHECK_INTERVAL = 1 << 12
+
+
+def _check_deadline(deadline: Optional[float]) -> None:
+    """Викидає TimeoutError, якщо перебір перевищив бюджет часу."""
+    if deadline is not None and time.perf_counter() > deadline:
+        raise TimeoutError("Повний перебір перевищив бюджет часу.")
+
+
+def _scaled_deviation(
+    costs: list[int], total: int, num_owners: int = NUM_OWNERS
+) -> int:
+    """
+    Обчислює максимальне відхилення, помножене на кількість забудовників.
+
+    Масштабування дозволяє порівнювати відхилення в цілих числах без похибок
+    округлення: max|c - S/k| * k = max|k*c - S|.
+    """
+    return max(abs(num_owners * c - total) for c in costs)
+
+
+def _global_lower_bound(
+    cells: list[int], total: int, num_owners: int = NUM_OWNERS
+) -> int:
+    """
+    Повертає нижню межу масштабованого відхилення для будь-якого розподілу.
+
+    Враховує подільність загальної суми на кількість забудовників
+    та найдорожчу клітинку, яка цілком дістається одному з них (лише для
+    невід'ємних вартостей: від'ємна клітинка того ж забудовника може
+    зменшити його суму).
+    """
+    floor_share = total // num_owners
+    ceil_share = -(-total // num_owners)
+    bound = max(num_owners * ceil_share - total, total - num_owners * floor_share)
+    if cells and min(cells) >= 0:
+        bound = max(bound, num_owners * max(cells) - total)
+    return bound
+
+
+def _greedy_upper_bound(
+    cells: list[int], total: int, num_owners: int = NUM_OWNERS
+) -> int:
+    """
+    Повертає масштабоване відхилення жадібного розподілу (найдорожчі клітинки
+    першими, кожна — забудовнику з найменшою сумою). Слугує початковим рекордом.
+    """
+    costs = [0] * num_owners
+    for cost in sorted(cells, reverse=True):
+        costs[costs.index(min(costs))] += cost
+    return _scaled_deviation(costs, total, num_owners)
+
+
+def _branch_and_bound(
+    cells: list[int],
+    num_owners: int = NUM_OWNERS,
+    prefix: Sequence[int] = (),
+    incumbent: Optional[Any] = None,
+    shard: tuple[int, int] = (0, 1),
+    deadline: Optional[float] = None,
+) -> Optional[tuple[int, list[int], list[int]]]:
+    """
+    Знаходить оптимальний розподіл методом гілок і меж.
+
+    Клітинки перебираються у тому ж порядку, що й у повному переборі, тому
+    знаходиться той самий (лексикографічно перший) оптимальний розподіл.
+
+    Аргументи:
+        cells: Вартості клітинок у порядку обходу матриці по рядках.
+        num_owners: Кількість забудовників.
+        prefix: Зафіксовані власники перших клітинок; пошук ведеться лише
+            серед розподілів із цим префіксом.
+        incumbent: Спільний між процесами рекорд (multiprocessing.Value
+            типу "q") — ключ dev · count + index найкращого знайденого
+            розв'язку, де dev — масштабоване відхилення, а (index, count) —
+            номер частини та кількість частин. Гілки, що не можуть дати
+            меншого ключа, відсікаються, а кращі розв'язки записуються.
+        shard: Пара (index, count) для ключа спільного рекорду. Частини з
+            меншим номером лексикографічно раніші, тож рівний за
+            відхиленням розв'язок пізнішої частини відсікається.
+        deadline: Момент часу (за time.perf_counter), після якого пошук
+            переривається з TimeoutError; None — без обмеження.
+
+    Повертає:
+        Кортеж (масштабоване відхилення, assignment, costs) або None, якщо
+        всі гілки відсічено спільним рекордом.
+    """
+    total_cells = len(cells)
+    total = sum(cells)
+    lower_bound = _global_lower_bound(cells, total, num_owners)
+
+    # gains[pos] та losses[pos] — суми додатних та від'ємних вартостей
+    # клітинок, які ще не призначено: сума забудовника може зрости щонайбільше
+    # на gains[pos] і зменшитися щонайбільше на |losses[pos]|
+    gains = [0] * (total_cells + 1)
+    losses = [0] * (total_cells + 1)
+    for pos in range(total_cells - 1, -1, -1):
+        cost = cells[pos]
+        gains[pos] = gains[pos + 1] + max(cost, 0)
+        losses[pos] = losses[pos + 1] + min(cost, 0)
+
+    costs = [0] * num_owners
+    assignment = [0] * total_cells
+    for pos, owner in enumerate(prefix):
+        assignment[pos] = owner
+        costs[owner] += cells[pos]
+    best_assignment = assignment[:]
+    best_costs = costs[:]
+    # Початковий рекорд береться з жадібного розподілу; поки пошук не знайшов
+    # власного розв'язку, рівні йому гілки не відсікаються
+    best = _greedy_upper_bound(cells, total, num_owners)
+    found = False
+    # Стани (позиція, впорядковані суми), з яких не знайдено кращого розв'язку.
+    # Рекорд лише зменшується, тому повторний обхід такого стану марний.
+    # Множина обмежена MAX_FAILED_STATES записами
+    failed: set[tuple[int, tuple[int, ...]]] = set()
+    nodes = 0
+    # Спільний рекорд читається без блокування: значення лише зменшується,
+    # а застаріле значення тільки послаблює відсікання
+    shared = incumbent.get_obj() if incumbent is not None else None
+    shard_index, num_shards = shard
+
+    def search(pos: int, used: int) -> bool:
+        """
+        Рекурсивно призначає клітинку pos та повертає True, якщо досягнуто
+        нижньої межі і пошук можна зупинити.
+
+        Аргументи:
+            pos: Індекс поточної клітинки.
+            used: Кількість забудовників, яким вже призначено хоча б одну клітинку.
+        """
+        nonlocal best, found, best_assignment, best_costs, nodes
+
+        nodes += 1
+        if nodes % _DEADLINE_CHECK_INTERVAL == 0:
+            _check_deadline(deadline)
+
+        bound = max(
+            lower_bound,
+            num_owners * (max(costs) + losses[pos]) - total,
+            total - num_owners * (min(costs) + gains[pos]),
+        )
+        if bound > best or (found and bound >= best):
+            return False
+        if shared is not None and bound * num_shards + shard_index > shared.value:
+            return False
+
+        if pos == total_cells:
+            # На листку межа дорівнює точному відхиленню розподілу
+            best = bound
+            found = True
+            best_assignment = assignment[:]
+            best_costs = costs[:]
+            if shared is not None:
+                key = best * num_shards + shard_index
+                with incumbent.get_lock():
+                    if key < shared.value:
+                        shared.value = key
+            return best <= lower_bound
+
+        state = (pos, tuple(sorted(costs)))
+        if state in failed:
+            return False
+
+        cost = cells[pos]
+        # Забудовники взаємозамінні: новий забудовник з'являється лише
+        # наступним за номером, що відкидає симетричні розподіли
+        for owner in range(min(used + 1, num_owners)):
+            assignment[pos] = owner
+            costs[owner] += cost
+            stop = search(pos + 1, max(used, owner + 1))
+            costs[owner] -= cost
+            if stop:
+                return True
+        assignment[pos] = 0
+        if len(failed) < MAX_FAILED_STATES:
+            failed.add(state)
+        return False
+
+    search(len(prefix), max(prefix) + 1 if prefix else 0)
+    if not found:
+        return None
+    return best, best_assignment, best_costs
+
+
+def _gray_code_search(
+    cells: list[int], num_owners: int = NUM_OWNERS, deadline: Optional[float] = None
+) -> tuple[list[int], list[int]]:
     """
-    Виконує повний перебір всіх можливих призначень клітинок трьом забудовникам
-    та знаходить розподіл із мінімальним максимальним відхиленням від середньої вартості.
+    Перебирає всі призначення клітинок у порядку K-кового рефлексивного коду
+    Грея (алгоритм H Кнута для змішаної системи числення).
+
+    Сусідні стани відрізняються власником однієї клітинки, тож суми
+    забудовників оновлюються за O(1), без рекурсії та копіювання розподілу.
+    Стан кодується цілим числом, у якому клітинка 0 — старший K-ковий
+    розряд; запам'ятовується лише код найкращого стану, а розподіл
+    відновлюється наприкінці. За однакового відхилення обирається менший
+    код, тобто лексикографічно перший розподіл — той самий, що й у
+    рекурсивному переборі та в методі гілок і меж.
+
+    Забудовники взаємозамінні, тож лексикографічно перший оптимальний
+    розподіл завжди віддає клітинку 0 забудовнику 0; перебір ведеться лише
+    по решті клітинок, що скорочує його в K разів.
 
     Аргументи:
-        matrix: Матриця вартостей розміром m×n.
+        cells: Вартості клітинок у порядку обходу матриці по рядках.
+        num_owners: Кількість забудовників.
+        deadline: Момент часу (за time.perf_counter), після якого перебір
+            переривається з TimeoutError; None — без обмеження.
+
+    Повертає:
+        Кортеж (assignment, costs): власник кожної клітинки та сумарні витрати.
+    """
+    k = num_owners
+    total_cells = len(cells)
+    total = sum(cells)
+    # Спочатку всі клітинки належать забудовнику 0
+    sums = [0] * k
+    sums[0] = total
+    best_dev = _scaled_deviation(sums, total, k)
+    best_code = 0
+
+    # Розряд j відповідає клітинці total_cells - 1 - j і має вагу k^j
+    digits = max(total_cells - 1, 0) if k > 1 else 0
+    values = [0] * digits
+    directions = [1] * digits
+    focus = list(range(digits + 1))
+    weights = [k**j for j in range(digits)]
+    costs = [cells[total_cells - 1 - j] for j in range(digits)]
+    top = k - 1
+    code = 0
+    steps = 0
+
+    while True:
+        steps += 1
+        if steps % _DEADLINE_CHECK_INTERVAL == 0:
+            _check_deadline(deadline)
+        j = focus[0]
+        focus[0] = 0
+        if j == digits:
+            break
+
+        old = values[j]
+        new = old + directions[j]
+        values[j] = new
+        cost = costs[j]
+        sums[old] -= cost
+        sums[new] += cost
+        code += directions[j] * weights[j]
+        if new == 0 or new == top:
+            directions[j] = -directions[j]
+            focus[j] = focus[j + 1]
+            focus[j + 1] = j + 1
+
+        dev = max(k * max(sums) - total, total - k * min(sums))
+        if dev < best_dev or (dev == best_dev and code < best_code):
+            best_dev = dev
+            best_code = code
+
+    # Декодування найкращого стану
+    assignment = [0] * total_cells
+    best_costs = [0] * k
+    for pos in range(total_cells - 1, -1, -1):
+        best_code, owner = divmod(best_code, k)
+        assignment[pos] = owner
+        best_costs[owner] += cells[pos]
+    return assignment, best_costs
+
+
+def exhaustive_search(
+    matrix: Union[Grid, list[list[int]]],
+    m: int,
+    n: int,
+    mode: str = "full",
+    num_owners: int = NUM_OWNERS,
+    time_budget_ms: Optional[float] = None,
+) -> ExhaustiveResult:
+    """
+    Виконує повний перебір всіх можливих призначень клітинок num_owners
+    забудовникам та знаходить розподіл із мінімальним максимальним відхиленням
+    від середньої вартості.
+
+    Аргументи:
+        matrix: Матриця вартостей розміром m×n (Grid або список списків).
         m: Кількість рядків у матриці.
         n: Кількість стовпців у матриці.
+        mode: Спосіб перебору:
+            "full" → перебір усіх K^(m·n) призначень у порядку коду Грея,
+            "branch_and_bound" → метод гілок і меж із тим самим результатом,
+            придатний для матриць 5×5 і більших (його межі враховують і
+            від'ємні вартості, але відсікання тоді слабшає).
+        num_owners: Кількість забудовників K (за замовчуванням 3).
+        time_budget_ms: Бюджет часу в мілісекундах; обидва способи мають
+            експоненційний найгірший випадок (зокрема метод гілок і меж на
+            великих вартостях), тож після вичерпання бюджету викидається
+            TimeoutError. None — без обмеження.
 
     Повертає:
         Словник із ключами:
-            'matrix' → матриця розподілу (від 0 до 2),
+            'matrix' → матриця розподілу (від 0 до K-1),
             'total_costs' → список сумарних витрат для кожного забудовника,
             'max_deviation' → максимальне відхилення від середньої вартості,
             'execution_time' → час виконання (у секундах).
     """
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Невідомий спосіб перебору: {mode}")
+    if num_owners < 1:
+        raise ValueError("Кількість забудовників має бути додатною.")
+
     start_time = time.time()
+    deadline = (
+        None if time_budget_ms is None else time.perf_counter() + time_budget_ms / 1000
+    )
+    grid = as_grid(matrix, m, n)
+    cells = grid.costs
 
-    best_matrix: list[list[int]] = [[0] * n for _ in range(m)]
-    best_max_deviation = float("inf")
-    best_total_costs: list[int] = [0, 0, 0]
+    if mode == "branch_and_bound":
+        _, assignment, best_total_costs = _branch_and_bound(
+            list(cells), num_owners, deadline=deadline
+        )
+        avg_cost = sum(best_total_costs) / num_owners
+        best_max_deviation = max(abs(c - avg_cost) for c in best_total_costs)
 
-    def calculate_costs(distribution: list[list[int]]) -> list[int]:
-        """
-        Обчислює сумарні витрати для кожного з трьох забудовників
-        на основі поточного розподілу клітинок.
+        return {
+            "matrix": grid.to_matrix(assignment),
+            "total_costs": best_total_costs,
+            "max_deviation": best_max_deviation,
+            "execution_time": time.time() - start_time,
+        }
 
-        Аргументи:
-            distribution: Матриця розподілу, де кожна клітинка має власника 0, 1 або 2.
+    assignment, best_total_costs = _gray_code_search(list(cells), num_owners, deadline)
+    avg_cost = sum(best_total_costs) / num_owners
 
-        Повертає:
-            Список із трьома числами — витрати кожного забудовника.
-        """
-        costs = [0, 0, 0]
-        for i in range(m):
-            for j in range(n):
-                owner = distribution[i][j]
-                costs[owner] += matrix[i][j]
-        return costs
+    return {
+        "matrix": grid.to_matrix(assignment),
+        "total_costs": best_total_costs,
+        "max_deviation": max(abs(c - avg_cost) for c in best_total_costs),
+        "execution_time": time.time() - start_time,
+    }
 
-    total_cells = m * n
 
-    def backtrack(pos: int, current_distribution: list[list[int]]) -> None:
-        """
-        Рекурсивно перебирає всі можливі призначення клітинок трьом забудовникам.
+def _closest_pair(reach_row: int, target: int, limit: int) -> list[int]:
+    """
+    Повертає досяжні суми другого забудовника, найближчі до target зліва
+    та справа (не більше двох значень, не більше limit).
 
-        Аргументи:
-            pos: Індекс поточної клітинки (від 0 до m*n-1).
-            current_distribution: Матриця (m×n) із поточним призначенням власників.
-        """
-        nonlocal best_max_deviation, best_matrix, best_total_costs
+    Аргументи:
+        reach_row: Бітова маска досяжних сум (біт b означає суму b).
+        target: Бажана сума.
+        limit: Максимальна допустима сума.
+    """
+    candidates = []
+    below = reach_row & ((1 << (min(target, limit) + 1)) - 1)
+    if below:
+        candidates.append(below.bit_length() - 1)
+    above = reach_row >> (target + 1)
+    if above:
+        value = (above & -above).bit_length() + target
+        if value <= limit:
+            candidates.append(value)
+    return candidates
 
-        if pos == total_cells:
-            costs = calculate_costs(current_distribution)
-            avg_cost = sum(costs) / 3
-            max_dev = max(abs(c - avg_cost) for c in costs)
 
-            if max_dev < best_max_deviation:
-                best_max_deviation = max_dev
-                best_matrix = copy.deepcopy(current_distribution)
-                best_total_costs = costs[:]
-            return
+def exact_partition_solver(
+    matrix: Union[Grid, list[list[int]]], m: int, n: int
+) -> ExhaustiveResult:
+    """
+    Точно розв'язує задачу розподілу між трьома забудовниками динамічним
+    програмуванням за досяжними парами сум (sum_A, sum_B).
+
+    Відхилення залежить лише від сум забудовників, а не від розташування
+    клітинок, тому достатньо зберігати множину досяжних пар сум. Кожен рядок
+    множини кодується цілим числом як бітова маска, а суми обмежуються зверху
+    значенням, яке оптимальний розподіл не може перевищити. Складність
+    псевдополіноміальна: O(m·n·S²/w), де S — сума вартостей, w — розрядність
+    машинного слова, тому метод розрахований на обмежену верхню межу вартості c
+    (наприклад, 10×10 при c ≤ 50 розв'язується за секунди).
+
+    Аргументи:
+        matrix: Матриця вартостей розміром m×n (Grid або список списків).
+        m: Кількість рядків у матриці.
+        n: Кількість стовпців у матриці.
+
+    Повертає:
+        Словник того ж вигляду, що й exhaustive_search:
+            'matrix' → матриця розподілу (від 0 до 2),
+            'total_costs' → список сумарних витрат для кожного забудовника,
+            'max_deviation' → максимальне відхилення від середньої вартості,
+            'execution_time' → час виконання (у секундах).
+
+    Викидає:
+        ValueError: Якщо матриця містить від'ємні вартості (бітові маски
+            досяжних сум не можуть зсуватися на від'ємну величину).
+    """
+    start_time = time.time()
+
+    grid = as_grid(matrix, m, n)
+    cells = list(grid.costs)
+    if cells and min(cells) < 0:
+        raise ValueError("Точний розв'язувач потребує невід'ємних вартостей клітинок.")
+    total = sum(cells)
+    # Жоден забудовник в оптимальному розподілі не має суми, більшої за limit
+    limit = (total + _greedy_upper_bound(cells, total)) // NUM_OWNERS
+    mask = (1 << (limit + 1)) - 1
 
-        i = pos // n
-        j = pos % n
+    # layers[k][a] — бітова маска досяжних сум b після перших k клітинок,
+    # якщо перший забудовник має суму a
+    layers = [[1] + [0] * limit]
+    for cost in cells:
+        reach = layers[-1]
+        step = [0] * (limit + 1)
+        for a in range(limit + 1):
+            row = reach[a]
+            if row:
+                step[a] |= row | ((row << cost) & mask)
+                if a + cost <= limit:
+                    step[a + cost] |= row
+        layers.append(step)
 
-        for owner in range(3):
-            current_distribution[i][j] = owner
-            backtrack(pos + 1, current_distribution)
+    best_dev = None
+    best_a = best_b = 0
+    for a, row in enumerate(layers[-1]):
+        if not row:
+            continue
+        # Для фіксованої a відхилення опукле за b з мінімумом у (S - a) / 2
+        for b in _closest_pair(row, (total - a) // 2, limit):
+            c = total - a - b
+            if c < 0 or c > limit:
+                continue
+            dev = _scaled_deviation([a, b, c], total)
+            if best_dev is None or dev < best_dev:
+                best_dev, best_a, best_b = dev, a, b
 
-    initial_distribution = [[0 for _ in range(n)] for _ in range(m)]
-    backtrack(0, initial_distribution)
+    # Відновлення розподілу проходом по шарах у зворотному порядку
+    assignment = [0] * len(cells)
+    a, b = best_a, best_b
+    for k in range(len(cells) - 1, -1, -1):
+        cost = cells[k]
+        previous = layers[k]
+        if a >= cost and (previous[a - cost] >> b) & 1:
+            assignment[k] = 0
+            a -= cost
+        elif b >= cost and (previous[a] >> (b - cost)) & 1:
+            assignment[k] = 1
+            b -= cost
+        else:
+            assignment[k] = 2
 
-    end_time = time.time()
+    best_total_costs = [best_a, best_b, total - best_a - best_b]
+    avg_cost = sum(best_total_costs) / 3
 
     return {
-        "matrix": best_matrix,
+        "matrix": grid.to_matrix(assignment),
         "total_costs": best_total_costs,
-        "max_deviation": best_max_deviation,
-        "execution_time": end_time - start_time,
+        "max_deviation": max(abs(c - avg_cost) for c in best_total_costs),
+        "execution_time": time.time() - start_time,
     }
@@ -0,0 +1,110 @@
+"""
+experiment_engine.py
+
+Загальний рушій експериментів: незалежні випробування (значення параметра ×
+номер задачі) розподіляються між процесами пулу з детермінованими зернами,
+а метрики агрегуються для кожного значення параметра.
+"""
+
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+TrialFunction = Callable[[Any, int], Dict[str, float]]
+
+PERCENTILES = (50, 90, 95)
+
+
+def trial_seed(base_seed: int, point_index: int, task_index: int) -> int:
+    """
+    Повертає детерміноване зерно випробування, що залежить лише від базового
+    зерна, номера значення параметра та номера задачі (а не від порядку
+    виконання чи кількості процесів).
+    """
+    return random.Random(f"{base_seed}:{point_index}:{task_index}").randrange(2**32)
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Обчислює перцентиль із лінійною інтерполяцією між сусідніми значеннями."""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] * (1 - fraction) + sorted_values[upper] * fraction
+
+
+def aggregate(values: List[float]) -> Dict[str, float]:
+    """
+    Обчислює середнє, стандартне відхилення та перцентилі вибірки.
+
+    Повертає:
+        Словник із ключами 'mean', 'stddev', 'min', 'max' та 'p50', 'p90', 'p95'.
+    """
+    count = len(values)
+    mean = sum(values) / count
+    stddev = math.sqrt(sum((x - mean) ** 2 for x in values) / count)
+    ordered = sorted(values)
+    stats = {"mean": mean, "stddev": stddev, "min": ordered[0], "max": ordered[-1]}
+    for percent in PERCENTILES:
+        stats[f"p{percent}"] = _percentile(ordered, percent)
+    return stats
+
+
+def _run_trial(trial_fn: TrialFunction, point: Any, seed: int) -> Dict[str, float]:
+    """Виконує одне випробування."""
+    return trial_fn(point, seed)
+
+
+def run_experiment(
+    trial_fn: TrialFunction,
+    points: Sequence[Any],
+    num_tasks: int,
+    base_seed: int = 0,
+    workers: Optional[int] = None,
+) -> List[Dict[str, Dict[str, float]]]:
+    """
+    Виконує num_tasks випробувань для кожного значення параметра.
+
+    Аргументи:
+        trial_fn: Функція верхнього рівня (point, seed) → словник метрик;
+            має бути придатною для передачі в інший процес.
+        points: Значення параметра експерименту.
+        num_tasks: Кількість випадкових задач для кожного значення.
+        base_seed: Базове зерно, з якого виводяться зерна випробувань.
+        workers: Кількість процесів (за замовчуванням — кількість ядер;
+            1 — послідовне виконання в поточному процесі).
+
+    Повертає:
+        Для кожного значення параметра — словник {метрика: статистики},
+        де статистики обчислюються функцією aggregate.
+    """
+    jobs: List[Tuple[int, Any, int]] = [
+        (point_index, point, trial_seed(base_seed, point_index, task_index))
+        for point_index, point in enumerate(points)
+        for task_index in range(num_tasks)
+    ]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        outcomes = [_run_trial(trial_fn, point, seed) for _, point, seed in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_run_trial, trial_fn, point, seed)
+                for _, point, seed in jobs
+            ]
+            outcomes = [future.result() for future in futures]
+
+    samples: List[Dict[str, List[float]]] = [{} for _ in points]
+    for (point_index, _, _), metrics in zip(jobs, outcomes):
+        for name, value in metrics.items():
+            samples[point_index].setdefault(name, []).append(value)
+
+    return [
+        {name: aggregate(values) for name, values in point_samples.items()}
+        for point_samples in samples
+    ]
@@ -6,19 +6,129 @@ experiments.py
 - 3.4.2.1: Вплив верхньої межі вартості ділянки на ефективність алгоритмів.
 - 3.4.3.1: Залежність часу виконання від розмірності матриці.
 - 3.4.3.2: Залежність точності від розмірності матриці.
+
+Випробування виконуються паралельно рушієм experiment_engine з
+детермінованими зернами, тому результати не залежать від кількості процесів.
 """
 
+import random
+from functools import partial
+from typing import Optional
+
 from greedy_algorithm import greedy_algorithm
 from approximate_algorithm import approximate_algorithm
-from exhaustive_search import exhaustive_search
+from exhaustive_search import exhaustive_search, exact_partition_solver
 from helper_functions import generate_random_matrix
-
-
-def experiment_3_4_1() -> tuple[list[int], list[float], list[float]]:
+from experiment_engine import run_experiment
+
+
+def _trial_iterations(m: int, n: int, k: int, seed: int) -> dict[str, float]:
+    """Одне випробування експерименту 3.4.1.1 для k ітерацій."""
+    rng = random.Random(seed)
+    # Генеруємо більш складні матриці з більшим розкидом значень
+    matrix = generate_random_matrix(m, n, 1, 50, rng=rng)  # Збільшили діапазон
+    result = approximate_algorithm(
+        matrix,
+        m,
+        n,
+        max_iterations=k,
+        stability_threshold=max(10, k // 10),  # Пропорційний поріг стабільності
+        local_search_type="1",
+        rng=rng,
+    )
+    return {
+        "max_dev": result["max_dev"],
+        "execution_time": result["execution_time"],
+        "iterations": result["iterations"],
+    }
+
+
+def _trial_cost_bound(m: int, n: int, c_val: int, seed: int) -> dict[str, float]:
+    """Одне випробування експерименту 3.4.2.1 для верхньої межі c_val."""
+    rng = random.Random(seed)
+    matrix = generate_random_matrix(m, n, 1, c_val, rng=rng)
+    g_res = greedy_algorithm(
+        matrix,
+        m,
+        n,
+        max_iterations=1000,
+        stability_threshold=50,
+        local_search_type="1",
+        rng=rng,
+    )
+    a_res = approximate_algorithm(
+        matrix,
+        m,
+        n,
+        max_iterations=1000,
+        stability_threshold=50,
+        local_search_type="1",
+        rng=rng,
+    )
+    try:
+        e_res = exhaustive_search(matrix, m, n)
+    except ValueError:
+        e_res = {"max_deviation": 0.0, "execution_time": 0.0}
+
+    return {
+        "g_dev": g_res.get("max_dev", 0.0),
+        "a_dev": a_res.get("max_dev", 0.0),
+        "e_dev": e_res.get("max_deviation", 0.0),
+        "g_time": g_res.get("execution_time", 0.0),
+        "a_time": a_res.get("execution_time", 0.0),
+        "e_time": e_res.get("execution_time", 0.0),
+    }
+
+
+def _trial_size(size: int, seed: int, with_exact: bool = False) -> dict[str, float]:
+    """Одне випробування експериментів 3.4.3.1 та 3.4.3.2 для розмірності size."""
+    rng = random.Random(seed)
+    matrix = generate_random_matrix(size, size, 1, 30, rng=rng)
+    g_res = greedy_algorithm(
+        matrix,
+        size,
+        size,
+        max_iterations=1000,
+        stability_threshold=50,
+        local_search_type="1",
+        rng=rng,
+    )
+    a_res = approximate_algorithm(
+        matrix,
+        size,
+        size,
+        max_iterations=1000,
+        stability_threshold=50,
+        local_search_type="1",
+        rng=rng,
+    )
+    metrics = {
+        "g_dev": g_res.get("max_dev", 0.0),
+        "a_dev": a_res.get("max_dev", 0.0),
+        "g_time": g_res.get("execution_time", 0.0),
+        "a_time": a_res.get("execution_time", 0.0),
+    }
+    if with_exact:
+        # Опорне значення: точний розподіл сум між трьома забудовниками без
+        # вимоги зв'язності, оцінений тією ж метрикою max - min, що й
+        # евристики (сам розв'язувач мінімізує max|c - avg|)
+        e_res = exact_partition_solver(matrix, size, size)
+        e_costs = e_res["total_costs"]
+        metrics["e_dev"] = max(e_costs) - min(e_costs)
+    return metrics
+
+
+def experiment_3_4_1(
+    workers: Optional[int] = None, base_seed: int = 0
+) -> tuple[list[int], list[float], list[float]]:
     """
     3.4.1.1 — Вплив кількості ітерацій наближеного алгоритму на точність і час.
     Виправлена версія для кращої демонстрації залежності від ітерацій.
 
+    Аргументи:
+        workers: Кількість процесів (за замовчуванням — кількість ядер).
+        base_seed: Базове зерно для генерації задач.
+
     Повертає:
         iteration_values: Список значень максимальної кількості ітерацій.
         deviations: Середні відхилення для кожного значення ітерацій.
@@ -31,48 +141,34 @@ def experiment_3_4_1() -> tuple[list[int], list[float], list[float]]:
     # Більший діапазон ітерацій з меншим кроком для кращої демонстрації
     iteration_values = [5, 10, 20, 50, 100, 200, 500, 1000, 2000]
 
+    stats = run_experiment(
+        partial(_trial_iterations, m, n),
+        iteration_values,
+        num_tasks,
+        base_seed=base_seed,
+        workers=workers,
+    )
+
     deviations: list[float] = []
     times: list[float] = []
 
-    for k in iteration_values:
-        total_deviation = 0.0
-        total_time = 0.0
+    for k, point in zip(iteration_values, stats):
+        deviation = point["max_dev"]
+        exec_time = point["execution_time"]
+        deviations.append(deviation["mean"])
+        times.append(exec_time["mean"])
 
         print(f"\nТестування з {k} ітераціями...")
-
-        for task_num in range(num_tasks):
-            # Генеруємо більш складні матриці з більшим розкидом значень
-            matrix = generate_random_matrix(m, n, 1, 50)  # Збільшили діапазон
-
-            result = approximate_algorithm(
-                matrix,
-                m,
-                n,
-                max_iterations=k,
-                stability_threshold=max(10, k // 10),  # Пропорційний поріг стабільності
-                local_search_type="1",
-            )
-
-            total_deviation += result["max_dev"]
-            total_time += result["execution_time"]
-
-            if task_num == 0:  # Виводимо інформацію для першої задачі
-                print(
-                    f"  Задача 1: ітерацій {result['iterations']}, відхилення {result['max_dev']}"
-                )
-
-        avg_deviation = total_deviation / num_tasks
-        avg_time = total_time / num_tasks
-
-        deviations.append(avg_deviation)
-        times.append(avg_time)
-
-        print(f"Середнє відхилення: {avg_deviation:.2f}, середній час: {avg_time:.4f}")
+        print(
+            f"Середнє відхилення: {deviation['mean']:.2f} "
+            f"(σ = {deviation['stddev']:.2f}, p95 = {deviation['p95']:.2f}), "
+            f"середній час: {exec_time['mean']:.4f}"
+        )
 
     return iteration_values, deviations, times
 
 
-def experiment_3_4_2() -> tuple[
+def experiment_3_4_2(workers: Optional[int] = None, base_seed: int = 0) -> tuple[
     list[int],
     list[float],
     list[float],
@@ -84,6 +180,10 @@ def experiment_3_4_2() -> tuple[
     """
     3.4.2.1 — Вплив верхньої межі вартості ділянки (c) на ефективність алгоритмів.
 
+    Аргументи:
+        workers: Кількість процесів (за замовчуванням — кількість ядер).
+        base_seed: Базове зерно для генерації задач.
+
     Повертає:
         c_values: Список значень параметра c.
         greedy_devs: Середні відхилення для жадібного алгоритму.
@@ -97,76 +197,35 @@ def experiment_3_4_2() -> tuple[
     c_values = [10, 20]
     num_tasks = 10
 
-    greedy_devs: list[float] = []
-    approx_devs: list[float] = []
-    exhaustive_devs: list[float] = []
-
-    greedy_times: list[float] = []
-    approx_times: list[float] = []
-    exhaustive_times: list[float] = []
-
-    for c_val in c_values:
-        g_dev_sum = 0.0
-        a_dev_sum = 0.0
-        e_dev_sum = 0.0
-        g_time_sum = 0.0
-        a_time_sum = 0.0
-        e_time_sum = 0.0
-
-        for _ in range(num_tasks):
-            matrix = generate_random_matrix(m, n, 1, c_val)
-            g_res = greedy_algorithm(
-                matrix,
-                m,
-                n,
-                max_iterations=1000,
-                stability_threshold=50,
-                local_search_type="1",
-            )
-            a_res = approximate_algorithm(
-                matrix,
-                m,
-                n,
-                max_iterations=1000,
-                stability_threshold=50,
-                local_search_type="1",
-            )
-            try:
-                e_res = exhaustive_search(matrix, m, n)
-            except ValueError:
-                e_res = {"max_deviation": 0.0, "execution_time": 0.0}
-
-            g_dev_sum += g_res.get("max_dev", 0.0)
-            a_dev_sum += a_res.get("max_dev", 0.0)
-            e_dev_sum += e_res.get("max_deviation", 0.0)
-
-            g_time_sum += g_res.get("execution_time", 0.0)
-            a_time_sum += a_res.get("execution_time", 0.0)
-            e_time_sum += e_res.get("execution_time", 0.0)
-
-        greedy_devs.append(g_dev_sum / num_tasks)
-        approx_devs.append(a_dev_sum / num_tasks)
-        exhaustive_devs.append(e_dev_sum / num_tasks)
-
-        greedy_times.append(g_time_sum / num_tasks)
-        approx_times.append(a_time_sum / num_tasks)
-        exhaustive_times.append(e_time_sum / num_tasks)
+    stats = run_experiment(
+        partial(_trial_cost_bound, m, n),
+        c_values,
+        num_tasks,
+        base_seed=base_seed,
+        workers=workers,
+    )
 
     return (
         c_values,
-        greedy_devs,
-        approx_devs,
-        exhaustive_devs,
-        greedy_times,
-        approx_times,
-        exhaustive_times,
+        [point["g_dev"]["mean"] for point in stats],
+        [point["a_dev"]["mean"] for point in stats],
+        [point["e_dev"]["mean"] for point in stats],
+        [point["g_time"]["mean"] for point in stats],
+        [point["a_time"]["mean"] for point in stats],
+        [point["e_time"]["mean"] for point in stats],
     )
 
 
-def experiment_3_4_3_1() -> tuple[list[int], list[float], list[float]]:
+def experiment_3_4_3_1(
+    workers: Optional[int] = None, base_seed: int = 0
+) -> tuple[list[int], list[float], list[float]]:
     """
     3.4.3.1 — Залежність часу виконання алгоритмів від розмірності матриці.
 
+    Аргументи:
+        workers: Кількість процесів (за замовчуванням — кількість ядер).
+        base_seed: Базове зерно для генерації задач.
+
     Повертає:
         sizes: Список розмірностей (m = n).
         greedy_times: Середній час жадібного алгоритму.
@@ -174,76 +233,46 @@ def experiment_3_4_3_1() -> tuple[list[int], list[float], list[float]]:
     """
     sizes = [3, 4, 5, 6]
     num_tasks = 10
-    greedy_times: list[float] = []
-    approx_times: list[float] = []
-
-    for size in sizes:
-        g_time_sum = 0.0
-        a_time_sum = 0.0
-        for _ in range(num_tasks):
-            matrix = generate_random_matrix(size, size, 1, 30)
-            g_res = greedy_algorithm(
-                matrix,
-                size,
-                size,
-                max_iterations=1000,
-                stability_threshold=50,
-                local_search_type="1",
-            )
-            a_res = approximate_algorithm(
-                matrix,
-                size,
-                size,
-                max_iterations=1000,
-                stability_threshold=50,
-                local_search_type="1",
-            )
-            g_time_sum += g_res.get("execution_time", 0.0)
-            a_time_sum += a_res.get("execution_time", 0.0)
-        greedy_times.append(g_time_sum / num_tasks)
-        approx_times.append(a_time_sum / num_tasks)
 
+    stats = run_experiment(
+        _trial_size, sizes, num_tasks, base_seed=base_seed, workers=workers
+    )
+
+    greedy_times = [point["g_time"]["mean"] for point in stats]
+    approx_times = [point["a_time"]["mean"] for point in stats]
     return sizes, greedy_times, approx_times
 
 
-def experiment_3_4_3_2() -> tuple[list[int], list[float], list[float]]:
+def experiment_3_4_3_2(
+    workers: Optional[int] = None, base_seed: int = 0
+) -> tuple[list[int], list[float], list[float], list[float]]:
     """
     3.4.3.2 — Залежність точності (макс. відхилення) від розмірності матриці.
 
+    Аргументи:
+        workers: Кількість процесів (за замовчуванням — кількість ядер).
+        base_seed: Базове зерно для генерації задач.
+
     Повертає:
         sizes: Список розмірностей (m = n).
         greedy_devs: Середні відхилення жадібного алгоритму.
         approx_devs: Середні відхилення наближеного алгоритму.
+        exact_devs: Середня різниця max - min сум точного розподілу між трьома
+            забудовниками без вимоги зв'язності (exact_partition_solver) —
+            опорна крива, а не оптимум для евристик з чотирма забудовниками.
     """
     sizes = [3, 4, 5, 6]
     num_tasks = 10
-    greedy_devs: list[float] = []
-    approx_devs: list[float] = []
-
-    for size in sizes:
-        g_dev_sum = 0.0
-        a_dev_sum = 0.0
-        for _ in range(num_tasks):
-            matrix = generate_random_matrix(size, size, 1, 30)
-            g_res = greedy_algorithm(
-                matrix,
-                size,
-                size,
-                max_iterations=1000,
-                stability_threshold=50,
-                local_search_type="1",
-            )
-            a_res = approximate_algorithm(
-                matrix,
-                size,
-                size,
-                max_iterations=1000,
-                stability_threshold=50,
-                local_search_type="1",
-            )
-            g_dev_sum += g_res.get("max_dev", 0.0)
-            a_dev_sum += a_res.get("max_dev", 0.0)
-        greedy_devs.append(g_dev_sum / num_tasks)
-        approx_devs.append(a_dev_sum / num_tasks)
-
-    return sizes, greedy_devs, approx_devs
+
+    stats = run_experiment(
+        partial(_trial_size, with_exact=True),
+        sizes,
+        num_tasks,
+        base_seed=base_seed,
+        workers=workers,
+    )
+
+    greedy_devs = [point["g_dev"]["mean"] for point in stats]
+    approx_devs = [point["a_dev"]["mean"] for point in stats]
+    exact_devs = [point["e_dev"]["mean"] for point in stats]
+    return sizes, greedy_devs, approx_devs, exact_devs
@@ -1,161 +1,141 @@
 """
 greedy_algorithm.py (остаточно виправлена версія)
 
-Реалізація жадібного алгоритму розподілу територій між чотирма забудовниками
-із контролем відхилення вартостей та поліпшеною поведінкою відносно ітерацій.
+Реалізація жадібного алгоритму розподілу територій між K забудовниками (за
+замовчуванням чотирма) із контролем відхилення вартостей та поліпшеною
+поведінкою відносно ітерацій.
 """
 
+from array import array
 from collections import deque
 import time
 import random
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Optional, Sequence, Tuple, Union
+from border_index import BorderCellIndex
+from cost_state import CostState
+from grid import Grid, as_grid, seed_cells
+from priority_expansion import EXPANSION_STRATEGIES, PriorityExpander
+from random_source import RandomSource, make_rng
+from results import GreedyResult
+from swap_index import SwapCandidateIndex, improving_swaps
 
 
 def _expand_territory(
     dev_id: int,
-    assignment_matrix: List[List[int]],
-    matrix: List[List[int]],
-    total_costs: Dict[int, int],
-    developers_area: Dict[int, List[Tuple[int, int]]],
+    grid: Grid,
+    owners: array,
+    cost_state: CostState,
+    developers_area: Dict[int, List[int]],
     queue: deque,
-    m: int,
-    n: int,
+    border_index: BorderCellIndex,
 ) -> bool:
     """Виконує одне крокове розширення для одного забудовника."""
     if not queue:
         return False
 
-    x, y = queue.popleft()
-    for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < m and 0 <= ny < n and assignment_matrix[nx][ny] == 0:
-            assignment_matrix[nx][ny] = dev_id
-            total_costs[dev_id] += matrix[nx][ny]
-            developers_area[dev_id].append((nx, ny))
-            queue.append((nx, ny))
+    cell = queue.popleft()
+    for offset in grid.offsets(cell):
+        neighbor = cell + offset
+        if owners[neighbor] == 0:
+            owners[neighbor] = dev_id
+            cost_state.add(dev_id, grid.costs[neighbor])
+            developers_area[dev_id].append(neighbor)
+            queue.append(neighbor)
+            border_index.update_around(neighbor)
             return True
     return False
 
 
 def _update_stagnation(
-    total_costs: Dict[int, int], previous_max_dev: int, stagnant_iters: int
+    cost_state: CostState, previous_max_dev: int, stagnant_iters: int
 ) -> Tuple[int, int]:
     """Обчислює нове значення max_dev і поновлює лічильник ітерацій без покращення."""
-    max_dev = max(total_costs.values()) - min(total_costs.values())
+    max_dev = cost_state.max_dev()
     if max_dev >= previous_max_dev:
         return stagnant_iters + 1, previous_max_dev
     return 0, max_dev
 
 
-def _check_cell_neighbors(
-    assignment_matrix: List[List[int]], i: int, j: int, m: int, n: int
-) -> bool:
-    """Перевіряє, чи має клітинка сусідів з іншими забудовниками."""
-    if assignment_matrix[i][j] == 0:
-        return False
-
-    current_owner = assignment_matrix[i][j]
-    for di, dj in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-        ni, nj = i + di, j + dj
-        if (
-            0 <= ni < m
-            and 0 <= nj < n
-            and assignment_matrix[ni][nj] != 0
-            and assignment_matrix[ni][nj] != current_owner
-        ):
-            return True
-    return False
-
-
-def _find_border_cells(
-    assignment_matrix: List[List[int]], m: int, n: int
-) -> List[Tuple[int, int]]:
-    """Знаходить всі клітинки на межі між забудовниками."""
-    border_cells = []
-    for i in range(m):
-        for j in range(n):
-            if _check_cell_neighbors(assignment_matrix, i, j, m, n):
-                border_cells.append((i, j))
-    return border_cells
-
-
 def _get_neighbor_owners(
-    assignment_matrix: List[List[int]],
-    i: int,
-    j: int,
-    current_owner: int,
-    m: int,
-    n: int,
+    grid: Grid, owners: array, cell: int, current_owner: int
 ) -> set:
     """Знаходить сусідніх забудовників для клітинки."""
     neighbors = set()
-    for di, dj in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-        ni, nj = i + di, j + dj
-        if (
-            0 <= ni < m
-            and 0 <= nj < n
-            and assignment_matrix[ni][nj] != 0
-            and assignment_matrix[ni][nj] != current_owner
-        ):
-            neighbors.add(assignment_matrix[ni][nj])
+    for offset in grid.offsets(cell):
+        owner = owners[cell + offset]
+        if owner != 0 and owner != current_owner:
+            neighbors.add(owner)
     return neighbors
 
 
 def _calculate_improvement(
-    assignment_matrix: List[List[int]],
-    matrix: List[List[int]],
-    total_costs: Dict[int, int],
-    i: int,
-    j: int,
+    grid: Grid,
+    owners: array,
+    cost_state: CostState,
+    border_index: BorderCellIndex,
+    cell: int,
+    swap_index: Optional[SwapCandidateIndex] = None,
 ) -> bool:
-    """Обчислює та застосовує покращення для клітинки."""
-    current_owner = assignment_matrix[i][j]
-    current_cost = matrix[i][j]
-    current_max_dev = max(total_costs.values()) - min(total_costs.values())
-
-    neighbors = _get_neighbor_owners(
-        assignment_matrix,
-        i,
-        j,
-        current_owner,
-        len(assignment_matrix),
-        len(assignment_matrix[0]),
-    )
+    """
+    Обчислює та застосовує покращення для клітинки: передачу сусідньому
+    забудовнику, а якщо її немає і задано swap_index — обмін з клітинкою
+    сусіднього забудовника.
+    """
+    current_owner = owners[cell]
+    current_cost = grid.costs[cell]
+    current_max_dev = cost_state.max_dev()
+
+    neighbors = _get_neighbor_owners(grid, owners, cell, current_owner)
 
     for new_owner in neighbors:
-        temp_costs = total_costs.copy()
-        temp_costs[current_owner] -= current_cost
-        temp_costs[new_owner] += current_cost
-        new_max_dev = max(temp_costs.values()) - min(temp_costs.values())
+        new_max_dev = cost_state.max_dev_after_transfer(
+            current_owner, new_owner, current_cost
+        )
 
         if new_max_dev < current_max_dev:
             # Здійснюємо обмін
-            assignment_matrix[i][j] = new_owner
-            total_costs[current_owner] -= current_cost
-            total_costs[new_owner] += current_cost
+            owners[cell] = new_owner
+            cost_state.transfer(current_owner, new_owner, current_cost)
+            border_index.update_around(cell)
+            if swap_index is not None:
+                swap_index.update_around(cell)
+            return True
+
+    if swap_index is not None:
+        for _, partner, new_owner, amount in improving_swaps(
+            swap_index, cost_state, cell, neighbors
+        ):
+            owners[cell] = new_owner
+            owners[partner] = current_owner
+            cost_state.transfer(current_owner, new_owner, amount)
+            for changed in (cell, partner):
+                border_index.update_around(changed)
+                swap_index.update_around(changed)
             return True
     return False
 
 
 def _perform_local_improvements(
-    assignment_matrix: List[List[int]],
-    matrix: List[List[int]],
-    total_costs: Dict[int, int],
-    m: int,
-    n: int,
+    grid: Grid,
+    owners: array,
+    cost_state: CostState,
+    border_index: BorderCellIndex,
+    rng: random.Random,
     improvements_per_iteration: int = 1,
+    swap_index: Optional[SwapCandidateIndex] = None,
 ) -> bool:
     """Виконує локальні покращення після заповнення матриці."""
     improved = False
 
     for _ in range(improvements_per_iteration):
-        border_cells = _find_border_cells(assignment_matrix, m, n)
-        if not border_cells:
+        if not border_index:
             break
 
         # Вибираємо випадкову межову клітинку
-        i, j = random.choice(border_cells)
-        if _calculate_improvement(assignment_matrix, matrix, total_costs, i, j):
+        cell = border_index.random_cell(rng)
+        if _calculate_improvement(
+            grid, owners, cost_state, border_index, cell, swap_index
+        ):
             improved = True
             break
 
@@ -163,82 +143,142 @@ def _perform_local_improvements(
 
 
 def _run_expansion_phase(
-    assignment_matrix: List[List[int]],
-    matrix: List[List[int]],
-    total_costs: Dict[int, int],
-    developers_area: Dict[int, List[Tuple[int, int]]],
+    grid: Grid,
+    owners: array,
+    cost_state: CostState,
+    developers_area: Dict[int, List[int]],
     queue: Dict[int, deque],
-    m: int,
-    n: int,
+    border_index: BorderCellIndex,
     local_search_type: str,
+    expander: Optional[PriorityExpander] = None,
 ) -> bool:
-    """Виконує фазу розширення територій."""
+    """
+    Виконує фазу розширення територій. Якщо задано expander, клітинки
+    приєднуються пріоритетно: кожна — до забудовника з найменшими витратами.
+    """
+    if expander is not None:
+        steps = 1 if local_search_type in ("1", "3") else len(queue)
+        any_moved = False
+        for _ in range(steps):
+            cell = expander.step()
+            if cell is None:
+                break
+            developers_area[owners[cell]].append(cell)
+            border_index.update_around(cell)
+            any_moved = True
+        return any_moved
+
     any_moved = False
-    for dev_id in range(1, 5):
+    for dev_id in range(1, cost_state.num_owners + 1):
         moved = _expand_territory(
             dev_id,
-            assignment_matrix,
-            matrix,
-            total_costs,
+            grid,
+            owners,
+            cost_state,
             developers_area,
             queue[dev_id],
-            m,
-            n,
+            border_index,
         )
         if moved:
             any_moved = True
-            if local_search_type == "1":
+            if local_search_type in ("1", "3"):
                 break
     return any_moved
 
 
 def _run_optimization_phase(
-    assignment_matrix: List[List[int]],
-    matrix: List[List[int]],
-    total_costs: Dict[int, int],
-    m: int,
-    n: int,
+    grid: Grid,
+    owners: array,
+    cost_state: CostState,
+    border_index: BorderCellIndex,
     local_search_type: str,
+    rng: random.Random,
+    swap_index: Optional[SwapCandidateIndex] = None,
 ) -> bool:
     """Виконує фазу локального покращення."""
     improvements_per_iteration = 2 if local_search_type == "2" else 1
     return _perform_local_improvements(
-        assignment_matrix, matrix, total_costs, m, n, improvements_per_iteration
+        grid,
+        owners,
+        cost_state,
+        border_index,
+        rng,
+        improvements_per_iteration,
+        swap_index,
     )
 
 
 def greedy_algorithm(
-    matrix: List[List[int]],
+    matrix: Union[Grid, List[List[int]]],
     m: int,
     n: int,
     max_iterations: int,
     stability_threshold: int,
     local_search_type: str,
-) -> Dict[str, Any]:
+    rng: RandomSource = None,
+    expansion_strategy: str = "fifo",
+    num_developers: int = 4,
+    seeds: Optional[Sequence[Tuple[int, int]]] = None,
+) -> GreedyResult:
     """
-    Жадібний алгоритм розподілу площі між 4 забудовниками.
+    Жадібний алгоритм розподілу площі між num_developers забудовниками.
     Модифікована версія з поліпшеною поведінкою відносно ітерацій.
+
+    Матриця вартостей може бути передана як Grid або як список списків
+    (тоді вона перетворюється у Grid). Функція нічого не виводить;
+    текстовий звіт формує reporting.format_greedy_result.
+
+    Параметр rng задає джерело випадковості (random.Random,
+    numpy.random.Generator або ціле зерно); з однаковим зерном результат
+    відтворюється.
+
+    Тип локального пошуку local_search_type: "1" — одна спроба покращення
+    за ітерацію, "2" — дві, "3" — як "1", але якщо передача клітинки не
+    покращує розподіл, шукається обмін двома клітинками між сусідніми
+    забудовниками (SwapCandidateIndex).
+
+    Параметр expansion_strategy обирає стратегію розширення: "fifo" або
+    "priority" (розширюється забудовник з найменшими витратами, обираючи
+    найдешевшу клітинку найближчого шару фронту, див. PriorityExpander).
+
+    Забудовник k починає з клітинки seeds[k - 1] (пари (рядок, стовпець));
+    за замовчуванням — кути матриці для K ≤ 4 і рівномірна решітка для
+    більшої кількості (див. grid.default_seeds).
     """
+    if expansion_strategy not in EXPANSION_STRATEGIES:
+        raise ValueError(f"Невідома стратегія розширення: {expansion_strategy}")
+
     start_time = time.time()
+    rng = make_rng(rng)
+
+    grid = as_grid(matrix, m, n)
+    start_cells = seed_cells(grid, num_developers, seeds)
+    owners = grid.new_owners()
+    cost_state = CostState(num_developers)
+    developers_area: Dict[int, List[int]] = {
+        i: [] for i in range(1, num_developers + 1)
+    }
 
-    assignment_matrix = [[0 for _ in range(n)] for _ in range(m)]
-    total_costs = {1: 0, 2: 0, 3: 0, 4: 0}
-    developers_area = {1: [], 2: [], 3: [], 4: []}
+    queue = {i: deque() for i in range(1, num_developers + 1)}
+    border_index = BorderCellIndex(grid, owners)
 
-    corners = [(0, 0), (0, n - 1), (m - 1, 0), (m - 1, n - 1)]
-    queue = {i: deque() for i in range(1, 5)}
+    # Ініціалізація початкових позицій
+    for dev_id, cell in enumerate(start_cells, start=1):
+        owners[cell] = dev_id
+        cost_state.add(dev_id, grid.costs[cell])
+        developers_area[dev_id].append(cell)
+        queue[dev_id].append(cell)
+        border_index.update_around(cell)
 
-    # Ініціалізація кутових позицій
-    for dev_id, (x, y) in enumerate(corners, start=1):
-        assignment_matrix[x][y] = dev_id
-        total_costs[dev_id] += matrix[x][y]
-        developers_area[dev_id].append((x, y))
-        queue[dev_id].append((x, y))
+    expander = None
+    if expansion_strategy == "priority":
+        expander = PriorityExpander(grid, owners, cost_state)
 
     num_iterations = 0
     stagnant_iters = 0
     previous_max_dev = float("inf")
     expansion_finished = False
+    swap_index: Optional[SwapCandidateIndex] = None
 
     while num_iterations < max_iterations and stagnant_iters < stability_threshold:
         num_iterations += 1
@@ -247,42 +287,53 @@ def greedy_algorithm(
         if not expansion_finished:
             # Фаза розширення
             any_moved = _run_expansion_phase(
-                assignment_matrix,
-                matrix,
-                total_costs,
+                grid,
+                owners,
+                cost_state,
                 developers_area,
                 queue,
-                m,
-                n,
+                border_index,
                 local_search_type,
+                expander,
             )
-            if not any_moved:
+            assigned = sum(len(area) for area in developers_area.values())
+            if not any_moved and expander is None and assigned < len(owners):
+                # Черга FIFO відкидає клітинку після першого розширення з неї,
+                # тож нічийні кишені (за початкових клітинок не в кутах)
+                # добираються пріоритетним розширенням
+                expander = PriorityExpander(grid, owners, cost_state)
+                any_moved = True
+            elif not any_moved:
                 expansion_finished = True
+                if local_search_type == "3":
+                    swap_index = SwapCandidateIndex(grid, owners)
+                    swap_index.rebuild()
 
         if expansion_finished:
             # Фаза локального покращення
             any_moved = _run_optimization_phase(
-                assignment_matrix, matrix, total_costs, m, n, local_search_type
+                grid,
+                owners,
+                cost_state,
+                border_index,
+                local_search_type,
+                rng,
+                swap_index,
             )
 
         # Додаткові випадкові покращення якщо немає прогресу
-        if not any_moved and expansion_finished and random.random() < 0.1:
-            _perform_local_improvements(assignment_matrix, matrix, total_costs, m, n, 1)
+        if not any_moved and expansion_finished and rng.random() < 0.1:
+            _perform_local_improvements(
+                grid, owners, cost_state, border_index, rng, 1, swap_index
+            )
 
         stagnant_iters, previous_max_dev = _update_stagnation(
-            total_costs, previous_max_dev, stagnant_iters
+            cost_state, previous_max_dev, stagnant_iters
         )
 
     exec_time = time.time() - start_time
-
-    print("\n=== Жадібний алгоритм ===")
-    print("\nМатриця розподілу:")
-    for row in assignment_matrix:
-        print(" ".join(str(cell) for cell in row))
-    print(f"\nКількість ітерацій: {num_iterations}")
-    print(f"Час виконання: {exec_time:.4f} секунд")
-    print(f"Загальна вартість для кожного забудовника: {total_costs}")
-    print(f"Якість рішення (макс. відхилення): {previous_max_dev}")
+    assignment_matrix = grid.to_matrix(owners)
+    total_costs = cost_state.as_dict()
 
     return {
         "matrix": assignment_matrix,
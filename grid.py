@@ -0,0 +1,212 @@
+"""
+grid.py
+
+Модуль з компактним поданням матриці вартостей. Вартості зберігаються у
+плоскому масиві array('i'), клітинка задається одним індексом i * n + j,
+а сусіди обчислюються за заздалегідь підготовленими таблицями зсувів.
+"""
+
+import math
+from array import array
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+# Клас клітинки — набір прапорців, що вказують, біля яких країв вона лежить
+_TOP, _BOTTOM, _LEFT, _RIGHT = 1, 2, 4, 8
+
+
+class Grid:
+    """
+    Матриця вартостей m×n у плоскому масиві з таблицями зсувів до сусідів.
+
+    Атрибути:
+        m: Кількість рядків.
+        n: Кількість стовпців.
+        costs: Вартості клітинок у порядку обходу по рядках.
+        cell_class: Клас кожної клітинки (положення відносно країв матриці).
+        side_offsets: Для кожного класу — зсуви до сусідів по стороні
+            у порядку: вгору, вниз, вліво, вправо.
+        ring_offsets: Для кожного класу — зсуви до восьми сусідів кільця
+            за годинниковою стрілкою, починаючи з лівого верхнього
+            (None, якщо сусід за межами матриці).
+
+    Методи:
+        from_matrix(matrix): Створює Grid зі списку списків.
+        new_owners(): Повертає порожній масив власників клітинок.
+        offsets(cell): Зсуви до сусідів клітинки по стороні.
+        coords(cell): Перетворює індекс клітинки у пару (i, j).
+        to_matrix(values): Перетворює плоский масив у список списків.
+    """
+
+    def __init__(self, m: int, n: int, costs: Iterable[int]):
+        self.m = m
+        self.n = n
+        # Масив або відображений у пам'ять буфер (memoryview формату "i")
+        # використовуються без копіювання
+        self.costs = (
+            costs if isinstance(costs, (array, memoryview)) else array("i", costs)
+        )
+        if len(self.costs) != m * n:
+            raise ValueError("Кількість вартостей не відповідає розмірам матриці.")
+
+        # Класи клітинок рядка залежать лише від того, чи рядок крайній, тож
+        # масив класів складається з копій трьох шаблонів рядка
+        self.cell_class = array("B")
+        if m:
+            top = _TOP | (_BOTTOM if m == 1 else 0)
+            self.cell_class.extend(self._row_classes(top, n))
+        if m > 1:
+            self.cell_class.extend(self._row_classes(0, n) * (m - 2))
+            self.cell_class.extend(self._row_classes(_BOTTOM, n))
+
+        self.side_offsets: List[Tuple[int, ...]] = []
+        self.ring_offsets: List[Tuple[Union[int, None], ...]] = []
+        for cls in range(16):
+            self.side_offsets.append(self._build_side_offsets(cls))
+            self.ring_offsets.append(self._build_ring_offsets(cls))
+
+    @staticmethod
+    def _row_classes(flags: int, n: int) -> array:
+        """Повертає класи клітинок рядка довжини n із прапорцями рядка flags."""
+        row = array("B", [flags]) * n
+        if n:
+            row[0] |= _LEFT
+            row[-1] |= _RIGHT
+        return row
+
+    def _inside(self, cls: int, di: int, dj: int) -> bool:
+        """Перевіряє, чи лежить сусід зі зсувом (di, dj) у межах матриці."""
+        return not (
+            (di < 0 and cls & _TOP)
+            or (di > 0 and cls & _BOTTOM)
+            or (dj < 0 and cls & _LEFT)
+            or (dj > 0 and cls & _RIGHT)
+        )
+
+    def _build_side_offsets(self, cls: int) -> Tuple[int, ...]:
+        """Будує зсуви до сусідів по стороні для класу клітинки."""
+        return tuple(
+            di * self.n + dj
+            for di, dj in ((-1, 0), (1, 0), (0, -1), (0, 1))
+            if self._inside(cls, di, dj)
+        )
+
+    def _build_ring_offsets(self, cls: int) -> Tuple[Union[int, None], ...]:
+        """Будує зсуви до восьми сусідів кільця для класу клітинки."""
+        ring = (
+            (-1, -1),
+            (-1, 0),
+            (-1, 1),
+            (0, 1),
+            (1, 1),
+            (1, 0),
+            (1, -1),
+            (0, -1),
+        )
+        return tuple(
+            di * self.n + dj if self._inside(cls, di, dj) else None for di, dj in ring
+        )
+
+    @classmethod
+    def from_matrix(cls, matrix: Sequence[Sequence[int]]) -> "Grid":
+        """Створює Grid зі списку списків вартостей."""
+        m = len(matrix)
+        n = len(matrix[0]) if m else 0
+        costs = array("i")
+        for row in matrix:
+            costs.extend(row)
+        return cls(m, n, costs)
+
+    def new_owners(self) -> array:
+        """Повертає масив власників клітинок, заповнений нулями (нічийні)."""
+        return array("i", bytes(4 * self.m * self.n))
+
+    def offsets(self, cell: int) -> Tuple[int, ...]:
+        """Повертає зсуви від клітинки до її сусідів по стороні."""
+        return self.side_offsets[self.cell_class[cell]]
+
+    def coords(self, cell: int) -> Tuple[int, int]:
+        """Перетворює індекс клітинки у пару (рядок, стовпець)."""
+        return divmod(cell, self.n)
+
+    def to_matrix(self, values: Sequence[int]) -> List[List[int]]:
+        """Перетворює плоский масив значень клітинок у список списків."""
+        n = self.n
+        return [list(values[i * n : (i + 1) * n]) for i in range(self.m)]
+
+
+def as_grid(matrix: Union[Grid, Sequence[Sequence[int]]], m: int, n: int) -> Grid:
+    """
+    Повертає Grid для вхідної матриці: Grid передається без змін,
+    список списків розміром m×n перетворюється у плоский масив.
+    """
+    if isinstance(matrix, Grid):
+        return matrix
+    costs = array("i")
+    for row in matrix[:m]:
+        costs.extend(row[:n])
+    return Grid(m, n, costs)
+
+
+def default_seeds(m: int, n: int, num_developers: int) -> List[Tuple[int, int]]:
+    """
+    Повертає початкові клітинки (рядок, стовпець) для num_developers
+    забудовників за замовчуванням.
+
+    До чотирьох забудовників займають кути матриці (у порядку: лівий
+    верхній, правий верхній, лівий нижній, правий нижній). Для більшої
+    кількості клітинки рівномірно розставляються по рядках майже квадратної
+    решітки, щоб території виходили компактними.
+    """
+    corners = [(0, 0), (0, n - 1), (m - 1, 0), (m - 1, n - 1)]
+    if num_developers <= 4 and len(set(corners[:num_developers])) == num_developers:
+        return corners[:num_developers]
+
+    rows = round(math.sqrt(num_developers * m / n)) if m and n else 0
+    rows = max(1, -(-num_developers // max(n, 1)), min(rows, m))
+    seeds = []
+    for r in range(rows):
+        i = (2 * r + 1) * m // (2 * rows)
+        cols = num_developers // rows + (1 if r < num_developers % rows else 0)
+        for c in range(cols):
+            seeds.append((i, (2 * c + 1) * n // (2 * cols)))
+    return seeds
+
+
+def seed_cells(
+    grid: Grid,
+    num_developers: int,
+    seeds: Optional[Sequence[Tuple[int, int]]] = None,
+) -> List[int]:
+    """
+    Перевіряє початкові клітинки забудовників і повертає їхні індекси.
+
+    Аргументи:
+        grid: Матриця вартостей.
+        num_developers: Кількість забудовників K.
+        seeds: Клітинки (рядок, стовпець) забудовників 1..K або None для
+            розстановки default_seeds.
+
+    Викидає:
+        ValueError: Якщо K не додатне, більше за кількість клітинок,
+            кількість клітинок не дорівнює K, клітинка лежить поза
+            матрицею або клітинки повторюються.
+    """
+    if num_developers < 1:
+        raise ValueError("Кількість забудовників має бути додатною.")
+    if num_developers > grid.m * grid.n:
+        raise ValueError("Забудовників більше, ніж клітинок у матриці.")
+    if seeds is None:
+        seeds = default_seeds(grid.m, grid.n, num_developers)
+    if len(seeds) != num_developers:
+        raise ValueError(
+            f"Потрібно {num_developers} початкових клітинок, задано {len(seeds)}."
+        )
+
+    cells = []
+    for i, j in seeds:
+        if not (0 <= i < grid.m and 0 <= j < grid.n):
+            raise ValueError(f"Початкова клітинка ({i}, {j}) поза межами матриці.")
+        cells.append(i * grid.n + j)
+    if len(set(cells)) != len(cells):
+        raise ValueError("Початкові клітинки забудовників повторюються.")
+    return cells
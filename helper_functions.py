@@ -3,15 +3,27 @@ helper_functions.py
 
 Модуль містить допоміжні функції:
 - генерація випадкової матриці,
-- зчитування матриці з файлу,
+- зчитування матриці з текстового та двійкового файлу,
 - відображення матриці на екран.
 """
 
-import random
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from grid import Grid
+from random_source import RandomSource, make_rng
+
+# Двійковий формат матриці: сигнатура, m, n, код типу значень і вирівнювання
+# до 16 байтів; далі m·n значень int32 у порядку little-endian
+BINARY_MAGIC = b"CGRD"
+_BINARY_HEADER = struct.Struct("<4sIIc3x")
 
 
 def generate_random_matrix(
-    m: int, n: int, min_val: int = 1, max_val: int = 10
+    m: int, n: int, min_val: int = 1, max_val: int = 10, rng: RandomSource = None
 ) -> list[list[int]]:
     """
     Генерує випадкову матрицю розміром m×n.
@@ -21,11 +33,86 @@ def generate_random_matrix(
         n: Кількість стовпців матриці.
         min_val: Мінімальне значення елемента (включно).
         max_val: Максимальне значення елемента (включно).
+        rng: Джерело випадковості (random.Random, numpy.random.Generator,
+            ціле зерно або None).
 
     Повертає:
         Список списків (матрицю) із випадкових цілих чисел від min_val до max_val.
     """
-    return [[random.randint(min_val, max_val) for _ in range(n)] for _ in range(m)]
+    rng = make_rng(rng)
+    return [[rng.randint(min_val, max_val) for _ in range(n)] for _ in range(m)]
+
+
+def read_grid(filename: str) -> Grid | None:
+    """
+    Потоково зчитує матрицю з текстового файлу у компактний Grid.
+
+    Формат файлу такий самий, як у read_input_matrix. Рядки читаються по
+    одному й записуються одразу у заздалегідь виділений масив array('i'),
+    тож пам'ять не залежить від кількості Python-об'єктів у матриці.
+
+    Аргументи:
+        filename: Шлях до текстового файлу з матрицею.
+
+    Повертає:
+        Grid розміром m×n або None у разі помилки (файл не знайдено або
+        некоректний формат).
+    """
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            first = f.readline()
+
+            # Перевірка наявності хоча б одного рядка
+            if not first:
+                print("Помилка: файл порожній.")
+                return None
+
+            # Зчитуємо розміри матриці
+            first_line = first.strip().split()
+            if len(first_line) != 2:
+                print("Некоректний формат файлу: очікуються два числа у першому рядку.")
+                return None
+
+            m, n = map(int, first_line)
+            if m < 1 or n < 1:
+                print("Некоректні розміри матриці: m і n мають бути додатніми.")
+                return None
+
+            costs = array("i", bytes(4 * m * n))
+
+            # Зчитуємо m рядків по n чисел
+            for i in range(m):
+                line = f.readline()
+                # Перевірка, що у файлі є достатньо рядків
+                if not line:
+                    print("Некоректний формат файлу: недостатньо рядків.")
+                    return None
+                row_str = line.split()
+                if len(row_str) != n:
+                    print("Некоректний формат файлу: кількість стовпців не співпадає.")
+                    return None
+                try:
+                    costs[i * n : (i + 1) * n] = array("i", map(int, row_str))
+                except ValueError:
+                    print(
+                        "Некоректний формат файлу: значення мають бути цілими числами."
+                    )
+                    return None
+                except OverflowError:
+                    print(
+                        "Некоректний формат файлу: значення виходять за межі "
+                        "32-бітного цілого."
+                    )
+                    return None
+
+        return Grid(m, n, costs)
+
+    except IOError as e:
+        print(f"Помилка читання файлу: {e}")
+        return None
+    except ValueError as e:
+        print(f"Помилка обробки чисел у файлі: {e}")
+        return None
 
 
 def read_input_matrix(filename: str) -> tuple[int, int, list[list[int]]] | None:
@@ -43,54 +130,88 @@ def read_input_matrix(filename: str) -> tuple[int, int, list[list[int]]] | None:
         Кортеж (m, n, matrix), де matrix — список списків із розмірами m×n,
         або None у разі помилки (файл не знайдено або некоректний формат).
     """
+    grid = read_grid(filename)
+    if grid is None:
+        return None
+    return grid.m, grid.n, grid.to_matrix(grid.costs)
+
+
+def write_binary_grid(filename: str, grid: Grid) -> None:
+    """
+    Записує матрицю у двійковому форматі: заголовок (сигнатура, m, n,
+    код типу) і далі m·n вартостей int32 у порядку little-endian.
+    """
+    costs = array("i", grid.costs)
+    if sys.byteorder != "little":
+        costs.byteswap()
+    with open(filename, "wb") as f:
+        f.write(_BINARY_HEADER.pack(BINARY_MAGIC, grid.m, grid.n, b"i"))
+        costs.tofile(f)
+
+
+def read_binary_grid(filename: str) -> Grid | None:
+    """
+    Зчитує матрицю у двійковому форматі (див. write_binary_grid).
+
+    Дані відображаються у пам'ять (mmap) і передаються у Grid без
+    копіювання: сторінки файлу завантажуються лише під час звертання.
+    Відображення приватне, тож зміни вартостей не записуються у файл.
+
+    Повертає:
+        Grid розміром m×n або None у разі помилки (файл не знайдено або
+        некоректний формат).
+    """
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-
-        # Перевірка наявності хоча б одного рядка
-        if not lines:
-            print("Помилка: файл порожній.")
-            return None
-
-        # Зчитуємо розміри матриці
-        first_line = lines[0].strip().split()
-        if len(first_line) != 2:
-            print("Некоректний формат файлу: очікуються два числа у першому рядку.")
-            return None
-
-        m, n = map(int, first_line)
-        if m < 1 or n < 1:
-            print("Некоректні розміри матриці: m і n мають бути додатніми.")
-            return None
-
-        matrix: list[list[int]] = []
-
-        # Перевірка, що у файлі є достатньо рядків
-        if len(lines) < m + 1:
-            print("Некоректний формат файлу: недостатньо рядків.")
-            return None
-
-        # Зчитуємо m рядків по n чисел
-        for i in range(1, m + 1):
-            row_str = lines[i].strip().split()
-            if len(row_str) != n:
-                print("Некоректний формат файлу: кількість стовпців не співпадає.")
+        with open(filename, "rb") as f:
+            header = f.read(_BINARY_HEADER.size)
+            if not header:
+                print("Помилка: файл порожній.")
+                return None
+            if len(header) < _BINARY_HEADER.size:
+                print("Некоректний формат файлу: неповний заголовок.")
+                return None
+
+            magic, m, n, dtype = _BINARY_HEADER.unpack(header)
+            if magic != BINARY_MAGIC:
+                print("Некоректний формат файлу: невідома сигнатура.")
+                return None
+            if dtype != b"i":
+                print("Некоректний формат файлу: непідтримуваний тип значень.")
                 return None
-            try:
-                row = list(map(int, row_str))
-            except ValueError:
-                print("Некоректний формат файлу: значення мають бути цілими числами.")
+            if m < 1 or n < 1:
+                print("Некоректні розміри матриці: m і n мають бути додатніми.")
+                return None
+
+            data_size = 4 * m * n
+            if os.fstat(f.fileno()).st_size != _BINARY_HEADER.size + data_size:
+                print("Некоректний формат файлу: розмір даних не відповідає m×n.")
                 return None
-            matrix.append(row)
 
-        return m, n, matrix
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        costs = memoryview(mapped)[_BINARY_HEADER.size :].cast("i")
+        if sys.byteorder != "little":
+            costs = array("i", costs)
+            costs.byteswap()
+        return Grid(m, n, costs)
 
     except IOError as e:
         print(f"Помилка читання файлу: {e}")
         return None
-    except ValueError as e:
-        print(f"Помилка обробки чисел у файлі: {e}")
+
+
+def load_grid(filename: str) -> Grid | None:
+    """
+    Зчитує матрицю з файлу у двійковому або текстовому форматі, визначаючи
+    формат за сигнатурою на початку файлу.
+    """
+    try:
+        with open(filename, "rb") as f:
+            is_binary = f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+    except IOError as e:
+        print(f"Помилка читання файлу: {e}")
         return None
+    return read_binary_grid(filename) if is_binary else read_grid(filename)
 
 
 def display_matrix(matrix: list[list[int]]) -> None:
@@ -5,6 +5,9 @@ main.py
 - Вибір способу введення матриці та запуск алгоритмів.
 - Проведення експериментів та побудова графіків.
 - Логування виводу у файл.
+
+Без аргументів програма працює в інтерактивному режимі (меню). З
+аргументами командного рядка запускається пакетний режим (batch_runner).
 """
 
 import sys
@@ -12,54 +15,33 @@ import os
 from typing import Optional, Tuple, List
 from greedy_algorithm import greedy_algorithm
 from approximate_algorithm import approximate_algorithm
-from exhaustive_search import exhaustive_search
+from exhaustive_search import (
+    EXHAUSTIVE_TIME_BUDGET_MS,
+    MAX_EXHAUSTIVE_CELLS,
+    exhaustive_search,
+)
+from grid import Grid
+from reporting import (
+    format_approximate_result,
+    format_exhaustive_result,
+    format_greedy_result,
+)
 from helper_functions import (
     generate_random_matrix,
     read_input_matrix,
     display_matrix,
 )
+import batch_runner
+from buffered_logger import ERROR, BufferedLogger
+from solution_cache import SolutionCache
 import experiments
 import plotters
 
 PROMPT_INPUT = "Ваш вибір: "
 
-
-class Logger:
-    """
-    Клас для дублювання виводу у консоль та в лог-файл.
-
-    Методи:
-        write(message): Дублює повідомлення у консоль і записує у файл.
-        flush(): Очищує буфер виводу.
-        close(): Закриває лог-файл.
-    """
-
-    def __init__(self, filename: str):
-        self.terminal = sys.__stdout__
-        self.log = open(filename, "w", encoding="utf-8")
-
-    def write(self, message: str):
-        """
-        Дублює рядок у консоль та записує його у файл.
-
-        Args:
-            message: Текст для виводу.
-        """
-        self.terminal.write(message)
-        self.log.write(message)
-
-    def flush(self):
-        """
-        Очищає буфер виводу консолі та файлу.
-        """
-        self.terminal.flush()
-        self.log.flush()
-
-    def close(self):
-        """
-        Закриває лог-файл.
-        """
-        self.log.close()
+# Результати для повторних (з точністю до поворотів і відображень) матриць
+# протягом сеансу беруться з кешу
+SOLUTION_CACHE = SolutionCache(max_entries=64)
 
 
 def logged_input(prompt: str = "") -> str:
@@ -166,7 +148,12 @@ def solve_task() -> None:
 
     1) Жадібний (greedy_algorithm)
     2) Наближений (approximate_algorithm)
-    3) Повний перебір (exhaustive_search) для матриць розміром ≤ 3×3
+    3) Повний перебір (exhaustive_search) методом гілок і меж
+       для матриць із не більше ніж MAX_EXHAUSTIVE_CELLS клітинок з
+       бюджетом часу EXHAUSTIVE_TIME_BUDGET_MS
+
+    Результати для матриці, яку вже розв'язували в цьому сеансі (зокрема
+    повернутої чи відображеної), беруться з SOLUTION_CACHE.
     """
     print("Введіть спосіб введення матриці:")
     print("1 - Ручне введення")
@@ -188,40 +175,50 @@ def solve_task() -> None:
     if result is None:
         return
     m, n, _, matrix = result
+    grid = Grid.from_matrix(matrix)
 
     # Запуск жадібного та наближеного алгоритмів
-    greedy_algorithm(
-        matrix,
-        m,
-        n,
+    greedy_result = SOLUTION_CACHE.solve(
+        "greedy",
+        greedy_algorithm,
+        grid,
         max_iterations=1000,
         stability_threshold=50,
         local_search_type="1",
     )
-    approximate_algorithm(
-        matrix,
-        m,
-        n,
+    print(format_greedy_result(greedy_result))
+    approximate_result = SOLUTION_CACHE.solve(
+        "approximate",
+        approximate_algorithm,
+        grid,
         max_iterations=1000,
         stability_threshold=50,
         local_search_type="1",
     )
-
-    # Якщо матриця маленька, запускаємо повний перебір
-    if m * n > 9:
-        print("Розмір матриці перевищує 3×3, розв'язання повним перебором неможливе.")
+    print(format_approximate_result(approximate_result))
+
+    # Якщо матриця не надто велика, запускаємо повний перебір
+    if m * n > MAX_EXHAUSTIVE_CELLS:
+        print(
+            f"Матриця містить {m * n} клітинок (більше за {MAX_EXHAUSTIVE_CELLS}), "
+            "розв'язання повним перебором неможливе."
+        )
     else:
-        exhaustive_result = exhaustive_search(matrix, m, n)
-        if exhaustive_result:
-            print("Матриця розподілу:")
-            for row in exhaustive_result["matrix"]:
-                print(" ".join(str(cell) for cell in row))
-            print(f"Час виконання: {exhaustive_result['execution_time']:.4f} секунд")
+        try:
+            exhaustive_result = SOLUTION_CACHE.solve(
+                "exhaustive",
+                exhaustive_search,
+                grid,
+                mode="branch_and_bound",
+                time_budget_ms=EXHAUSTIVE_TIME_BUDGET_MS,
+            )
+        except TimeoutError:
             print(
-                "Загальна вартість для кожного забудовника: "
-                f"{exhaustive_result['total_costs']}"
+                "Повний перебір не завершився за "
+                f"{EXHAUSTIVE_TIME_BUDGET_MS / 1000:g} с і був перерваний."
             )
-            print(f"Максимальне відхилення: {exhaustive_result['max_deviation']}")
+        else:
+            print(format_exhaustive_result(exhaustive_result))
 
 
 def run_experiments() -> None:
@@ -289,8 +286,8 @@ def run_experiments() -> None:
         sizes, g_times, a_times = result
         plot_func(sizes, g_times, a_times)
     else:  # choice == "4"
-        sizes, g_devs, a_devs = result
-        plot_func(sizes, g_devs, a_devs)
+        sizes, g_devs, a_devs, e_devs = result
+        plot_func(sizes, g_devs, a_devs, e_devs)
 
     print("Експеримент завершено. Графіки збережено у папці 'experiment_plots'.")
 
@@ -321,13 +318,15 @@ def main() -> None:
     """
     Головна функція програми.
 
-    Перенаправляє stdout/stderr у лог-файл та запускає цикл меню:
+    Перенаправляє stdout/stderr у буферизований журнал (консоль і лог-файл)
+    та запускає цикл меню:
         1) Розв'язати задачу
         2) Провести експерименти
         0) Вийти
     """
-    sys.stdout = Logger("result_output.txt")
-    sys.stderr = sys.stdout
+    logger = BufferedLogger("result_output.txt")
+    sys.stdout = logger
+    sys.stderr = logger.stream(ERROR)
 
     try:
         continue_running = True
@@ -339,8 +338,12 @@ def main() -> None:
             user_choice = logged_input(PROMPT_INPUT).strip()
             continue_running = _process_main_choice(user_choice)
     finally:
-        sys.stdout.close()
+        sys.stdout = sys.__stdout__
+        sys.stderr = sys.__stderr__
+        logger.close()
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(batch_runner.main(sys.argv[1:]))
     main()
@@ -0,0 +1,349 @@
+"""
+metaheuristics.py
+
+Метаевристики на основі множини переходів наближеного алгоритму: межова
+клітинка передається сусідньому забудовнику, якщо обидві території
+залишаються зв'язними. На відміну від локального пошуку approximate_algorithm,
+який приймає лише покращення, тут допускаються й погіршення, що дозволяє
+виходити з локальних мінімумів:
+
+- імітація відпалу (simulated_annealing) з налаштовуваним охолодженням і
+  табу-списком нещодавно переданих клітинок;
+- пошук із заборонами (tabu_search), що на кожному кроці обирає найкращий
+  дозволений перехід серед вибірки межових клітинок.
+
+Зміна цільової функції кожного переходу оцінюється за O(1) через CostState,
+а перевірка зв'язності виконується лише для вже обраного переходу.
+"""
+
+import math
+import time
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from approximate_algorithm import (
+    BACKENDS,
+    _can_transfer_cell,
+    _get_neighbors,
+    _initialize_algorithm,
+    _run_expansion_phase,
+)
+from border_index import BorderCellIndex
+from grid import Grid, as_grid, seed_cells
+from random_source import RandomSource, make_rng
+from results import ApproximateResult
+
+COOLING_SCHEDULES = ("geometric", "linear")
+
+# Вага середнього квадратичного відхилення в енергії: розрізняє переходи з
+# однаковим max_dev і спрямовує пошук до рівномірнішого розподілу
+STDDEV_WEIGHT = 0.5
+
+
+class _SearchState:
+    """
+    Поточний розподіл разом з індексом межових клітинок, площами територій
+    та найкращим знайденим розподілом.
+    """
+
+    def __init__(self, grid: Grid, backend: str, seeds: Sequence[int]):
+        self.grid = grid
+        self.backend = backend
+        developers_area, cost_state, owners, frontier = _initialize_algorithm(
+            grid, seeds
+        )
+        self.expansion_iterations = _run_expansion_phase(
+            grid,
+            owners,
+            cost_state,
+            developers_area,
+            frontier,
+            grid.m * grid.n,
+        )
+        self.owners = owners
+        self.cost_state = cost_state
+        self.areas = array("i", [0] * (cost_state.num_owners + 1))
+        for owner in owners:
+            self.areas[owner] += 1
+
+        self.border_index = BorderCellIndex(grid, owners)
+        self.border_index.rebuild(backend)
+
+        self.best_owners = array("i", owners)
+        self.best_costs = cost_state.copy()
+        self.best_energy = self.energy()
+        self.best_key = self._quality()
+
+    def _quality(self) -> Tuple[int, float]:
+        """Якість розподілу для вибору найкращого: (max_dev, stddev)."""
+        return self.cost_state.max_dev(), self.cost_state.stddev()
+
+    def energy(self) -> float:
+        """Енергія поточного розподілу."""
+        return self.cost_state.max_dev() + STDDEV_WEIGHT * self.cost_state.stddev()
+
+    def energy_after(self, src: int, dst: int, amount: int) -> float:
+        """Енергія після передачі вартості amount від src до dst (за O(1))."""
+        cost_state = self.cost_state
+        return cost_state.max_dev_after_transfer(
+            src, dst, amount
+        ) + STDDEV_WEIGHT * cost_state.stddev_after_transfer(src, dst, amount)
+
+    def candidate_moves(self, cell: int) -> List[Tuple[int, int]]:
+        """
+        Повертає можливі переходи клітинки (cell, новий власник). Клітинка
+        не забирається в забудовника, у якого вона остання.
+        """
+        owner = self.owners[cell]
+        if self.areas[owner] <= 1:
+            return []
+        return [
+            (cell, new_owner)
+            for new_owner in _get_neighbors(self.grid, self.owners, cell, owner)
+        ]
+
+    def apply(self, cell: int, new_owner: int) -> bool:
+        """Виконує перехід, якщо він зберігає зв'язність територій."""
+        owner = self.owners[cell]
+        if not _can_transfer_cell(
+            self.grid, self.owners, cell, new_owner, self.backend
+        ):
+            return False
+        self.cost_state.transfer(owner, new_owner, self.grid.costs[cell])
+        self.areas[owner] -= 1
+        self.areas[new_owner] += 1
+        self.border_index.update_around(cell)
+        return True
+
+    def remember_if_best(self, energy: float) -> None:
+        """
+        Оновлює найкращу енергію (для критерію аспірації) та зберігає
+        поточний розподіл, якщо він кращий за найкращий за (max_dev, stddev).
+        """
+        self.best_energy = min(self.best_energy, energy)
+        quality = self._quality()
+        if quality < self.best_key:
+            self.best_key = quality
+            self.best_owners[:] = self.owners
+            self.best_costs = self.cost_state.copy()
+
+    def result(
+        self, start_time: float, optimization_iterations: int
+    ) -> ApproximateResult:
+        """Формує результат із найкращого знайденого розподілу."""
+        best_costs = self.best_costs
+        return {
+            "matrix": self.grid.to_matrix(self.best_owners),
+            "total_costs": best_costs.as_dict(),
+            "execution_time": time.time() - start_time,
+            "iterations": self.expansion_iterations + optimization_iterations,
+            "expansion_iterations": self.expansion_iterations,
+            "optimization_iterations": optimization_iterations,
+            "avg_dev": best_costs.stddev(),
+            "max_dev": best_costs.max_dev(),
+        }
+
+
+def _deadline(time_budget_ms: Optional[float]) -> Optional[float]:
+    """Момент завершення за time.perf_counter або None без обмеження часу."""
+    if time_budget_ms is None:
+        return None
+    return time.perf_counter() + time_budget_ms / 1000
+
+
+def _default_temperature(grid: Grid) -> float:
+    """Початкова температура за замовчуванням — середня вартість клітинки."""
+    return max(1.0, sum(grid.costs) / max(len(grid.costs), 1))
+
+
+def simulated_annealing(
+    matrix: Union[Grid, List[List[int]]],
+    m: int,
+    n: int,
+    max_iterations: int = 100000,
+    initial_temperature: Optional[float] = None,
+    cooling: str = "geometric",
+    cooling_rate: float = 0.9995,
+    min_temperature: float = 0.01,
+    tabu_tenure: int = 0,
+    time_budget_ms: Optional[float] = None,
+    backend: str = "python",
+    rng: RandomSource = None,
+    num_developers: int = 4,
+    seeds: Optional[Sequence[Tuple[int, int]]] = None,
+) -> ApproximateResult:
+    """
+    Імітація відпалу для задачі розподілу між K забудовниками.
+
+    Початковий розподіл будується етапом розширення наближеного алгоритму.
+    На кожній ітерації обирається випадкова межова клітинка та випадковий
+    сусідній забудовник; перехід з приростом енергії delta приймається з
+    імовірністю exp(-delta / T). Енергія — max_dev плюс STDDEV_WEIGHT ×
+    середнє квадратичне відхилення витрат.
+
+    Аргументи:
+        matrix: Матриця вартостей розміром m×n (Grid або список списків).
+        m: Кількість рядків у матриці.
+        n: Кількість стовпців у матриці.
+        max_iterations: Максимальна кількість ітерацій відпалу.
+        initial_temperature: Початкова температура (за замовчуванням —
+            середня вартість клітинки).
+        cooling: Схема охолодження: "geometric" (T ← T × cooling_rate) або
+            "linear" (T спадає лінійно до min_temperature за max_iterations
+            ітерацій або за бюджет часу).
+        cooling_rate: Коефіцієнт геометричного охолодження.
+        min_temperature: Температура, після досягнення якої відпал зупиняється.
+        tabu_tenure: Скільки ітерацій передана клітинка не може бути передана
+            знову (0 — без табу-списку). Заборона знімається, якщо перехід
+            дає енергію, кращу за найкращу знайдену.
+        time_budget_ms: Обмеження часу оптимізації в мілісекундах.
+        backend: Реалізація повних проходів по матриці ("python" або "numpy").
+        rng: Джерело випадковості (random.Random, numpy.random.Generator,
+            ціле зерно або None).
+        num_developers: Кількість забудовників K.
+        seeds: Початкові клітинки (рядок, стовпець) забудовників 1..K
+            (за замовчуванням grid.default_seeds).
+
+    Повертає:
+        Словник із ключами як у approximate_algorithm для найкращого
+        знайденого розподілу.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Невідомий backend: {backend}")
+    if cooling not in COOLING_SCHEDULES:
+        raise ValueError(f"Невідома схема охолодження: {cooling}")
+
+    start_time = time.time()
+    rng = make_rng(rng)
+    grid = as_grid(matrix, m, n)
+    state = _SearchState(grid, backend, seed_cells(grid, num_developers, seeds))
+
+    temperature = (
+        initial_temperature
+        if initial_temperature is not None
+        else _default_temperature(grid)
+    )
+    start_temperature = temperature
+    started = time.perf_counter()
+    deadline = _deadline(time_budget_ms)
+    tabu_until: Dict[int, int] = {}
+    energy = state.energy()
+
+    iteration = 0
+    while iteration < max_iterations and temperature > min_temperature:
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        iteration += 1
+        if not state.border_index:
+            break
+
+        cell = state.border_index.random_cell(rng)
+        moves = state.candidate_moves(cell)
+        if moves:
+            _, new_owner = rng.choice(moves)
+            owner = state.owners[cell]
+            new_energy = state.energy_after(owner, new_owner, grid.costs[cell])
+            delta = new_energy - energy
+            allowed = tabu_until.get(cell, 0) < iteration or (
+                new_energy < state.best_energy
+            )
+            accepted = delta <= 0 or rng.random() < math.exp(-delta / temperature)
+            if allowed and accepted and state.apply(cell, new_owner):
+                energy = new_energy
+                if tabu_tenure:
+                    tabu_until[cell] = iteration + tabu_tenure
+                state.remember_if_best(energy)
+
+        if cooling == "geometric":
+            temperature *= cooling_rate
+        else:
+            if deadline is not None:
+                progress = (time.perf_counter() - started) / (deadline - started)
+            else:
+                progress = iteration / max_iterations
+            temperature = min_temperature + (start_temperature - min_temperature) * (
+                1 - min(progress, 1.0)
+            )
+
+    return state.result(start_time, iteration)
+
+
+def tabu_search(
+    matrix: Union[Grid, List[List[int]]],
+    m: int,
+    n: int,
+    max_iterations: int = 10000,
+    tabu_tenure: int = 10,
+    sample_size: int = 16,
+    time_budget_ms: Optional[float] = None,
+    backend: str = "python",
+    rng: RandomSource = None,
+    num_developers: int = 4,
+    seeds: Optional[Sequence[Tuple[int, int]]] = None,
+) -> ApproximateResult:
+    """
+    Пошук із заборонами для задачі розподілу між K забудовниками.
+
+    На кожній ітерації оцінюються всі переходи sample_size випадкових
+    межових клітинок і виконується найкращий дозволений перехід, навіть
+    якщо він погіршує розподіл. Передана клітинка потрапляє до табу-списку
+    на tabu_tenure ітерацій; заборона знімається, якщо перехід дає енергію,
+    кращу за найкращу знайдену (критерій аспірації).
+
+    Аргументи:
+        matrix: Матриця вартостей розміром m×n (Grid або список списків).
+        m: Кількість рядків у матриці.
+        n: Кількість стовпців у матриці.
+        max_iterations: Максимальна кількість ітерацій.
+        tabu_tenure: Тривалість заборони повторної передачі клітинки.
+        sample_size: Кількість межових клітинок, що оцінюються за ітерацію.
+        time_budget_ms: Обмеження часу оптимізації в мілісекундах.
+        backend: Реалізація повних проходів по матриці ("python" або "numpy").
+        rng: Джерело випадковості (random.Random, numpy.random.Generator,
+            ціле зерно або None).
+        num_developers: Кількість забудовників K.
+        seeds: Початкові клітинки (рядок, стовпець) забудовників 1..K
+            (за замовчуванням grid.default_seeds).
+
+    Повертає:
+        Словник із ключами як у approximate_algorithm для найкращого
+        знайденого розподілу.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Невідомий backend: {backend}")
+
+    start_time = time.time()
+    rng = make_rng(rng)
+    grid = as_grid(matrix, m, n)
+    state = _SearchState(grid, backend, seed_cells(grid, num_developers, seeds))
+    deadline = _deadline(time_budget_ms)
+    tabu_until: Dict[int, int] = {}
+
+    iteration = 0
+    while iteration < max_iterations:
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        iteration += 1
+        if not state.border_index:
+            break
+
+        scored = []
+        for _ in range(sample_size):
+            cell = state.border_index.random_cell(rng)
+            owner = state.owners[cell]
+            for _, new_owner in state.candidate_moves(cell):
+                new_energy = state.energy_after(owner, new_owner, grid.costs[cell])
+                scored.append((new_energy, cell, new_owner))
+        scored.sort()
+
+        for new_energy, cell, new_owner in scored:
+            if tabu_until.get(cell, 0) >= iteration and (
+                new_energy >= state.best_energy
+            ):
+                continue
+            if state.apply(cell, new_owner):
+                tabu_until[cell] = iteration + tabu_tenure
+                state.remember_if_best(new_energy)
+                break
+
+    return state.result(start_time, iteration)
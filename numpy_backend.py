@@ -0,0 +1,131 @@
+"""
+numpy_backend.py
+
+Векторизовані (NumPy) версії повних проходів по матриці розподілу:
+- пошук межових клітинок зсувом масиву на одну клітинку,
+- сумарні витрати забудовників точним підсумовуванням у int64 (np.add.at),
+- перевірка зв'язності територій розміткою компонент: векторизоване
+  об'єднання множин (підвішування коренів за ребрами та стискання шляхів).
+
+Функції працюють з тими ж Grid та масивами власників, що й звичайна
+реалізація, без копіювання даних, і повертають ідентичні результати.
+"""
+
+from array import array
+from typing import List, Tuple
+
+import numpy as np
+
+from grid import Grid
+
+
+def _owners_view(grid: Grid, owners: array) -> np.ndarray:
+    """Повертає двовимірне подання масиву власників без копіювання."""
+    return np.frombuffer(owners, dtype=np.intc).reshape(grid.m, grid.n)
+
+
+def _component_roots(grid: Grid, territory: np.ndarray) -> np.ndarray:
+    """
+    Розмічає компоненти зв'язності булевої маски m×n векторизованим
+    об'єднанням множин.
+
+    На кожному раунді корінь більшого номера на кінці ребра підвішується до
+    меншого (np.minimum.at), після чого шляхи стискаються подвоєнням
+    parent = parent[parent]. Раундів O(log(m·n)) на практиці, кожен — один
+    прохід по ребрах, на відміну від заливки, що потребує стільки проходів
+    по всій матриці, яким є діаметр території.
+
+    Повертає:
+        Плоский масив коренів: клітинки маски з однаковим коренем належать
+        одній компоненті (для клітинок поза маскою значення не визначене).
+    """
+    index = np.arange(grid.m * grid.n, dtype=np.intp).reshape(grid.m, grid.n)
+    vertical = territory[:-1] & territory[1:]
+    horizontal = territory[:, :-1] & territory[:, 1:]
+    heads = np.concatenate((index[:-1][vertical], index[:, :-1][horizontal]))
+    tails = np.concatenate((index[1:][vertical], index[:, 1:][horizontal]))
+
+    parent = index.ravel().copy()
+    while True:
+        head_roots = parent[heads]
+        tail_roots = parent[tails]
+        pending = head_roots != tail_roots
+        if not pending.any():
+            return parent
+        low = np.minimum(head_roots[pending], tail_roots[pending])
+        high = np.maximum(head_roots[pending], tail_roots[pending])
+        # high — корені (шляхи стиснуто), low < high, тож циклів немає
+        np.minimum.at(parent, high, low)
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+
+def border_mask(grid: Grid, owners: array) -> np.ndarray:
+    """
+    Повертає булеву маску m×n межових клітинок — клітинок, що мають
+    сусіда по стороні з іншим (ненульовим) забудовником.
+    """
+    view = _owners_view(grid, owners)
+    mask = np.zeros(view.shape, dtype=bool)
+
+    vertical = (view[:-1] != view[1:]) & (view[:-1] != 0) & (view[1:] != 0)
+    mask[:-1] |= vertical
+    mask[1:] |= vertical
+
+    horizontal = (
+        (view[:, :-1] != view[:, 1:]) & (view[:, :-1] != 0) & (view[:, 1:] != 0)
+    )
+    mask[:, :-1] |= horizontal
+    mask[:, 1:] |= horizontal
+    return mask
+
+
+def find_border_cells(grid: Grid, owners: array) -> List[Tuple[int, int]]:
+    """
+    Знаходить усі межові клітинки у порядку обходу по рядках.
+
+    Повертає:
+        Список пар (клітинка, власник), як і звичайна реалізація.
+    """
+    cells = np.flatnonzero(border_mask(grid, owners))
+    flat = np.frombuffer(owners, dtype=np.intc)
+    return list(zip(cells.tolist(), flat[cells].tolist()))
+
+
+def owner_totals(grid: Grid, owners: array, num_owners: int) -> List[int]:
+    """
+    Обчислює сумарні витрати кожного забудовника одним проходом np.add.at.
+
+    Повертає:
+        Список довжиною num_owners + 1, де елемент 0 — сума нічийних клітинок.
+    """
+    flat_owners = np.frombuffer(owners, dtype=np.intc)
+    costs = np.frombuffer(grid.costs, dtype=np.intc)
+    # Підсумовування в int64, а не через ваги np.bincount (float64, точні
+    # лише до 2^53), дає ті самі суми, що й звичайна реалізація
+    totals = np.zeros(num_owners + 1, dtype=np.int64)
+    np.add.at(totals, flat_owners, costs.astype(np.int64))
+    return [int(total) for total in totals]
+
+
+def check_connectivity(grid: Grid, owners: array, owner: int) -> bool:
+    """Перевіряє зв'язність території забудовника розміткою компонент."""
+    territory = _owners_view(grid, owners) == owner
+    cells = np.flatnonzero(territory)
+    if cells.size == 0:
+        return True
+    roots = _component_roots(grid, territory)[cells]
+    return bool((roots == roots[0]).all())
+
+
+def reconnects(grid: Grid, owners: array, targets: List[int], owner: int) -> bool:
+    """
+    Перевіряє розміткою компонент, чи з'єднані всі клітинки targets у
+    межах території забудовника.
+    """
+    territory = _owners_view(grid, owners) == owner
+    roots = _component_roots(grid, territory)[np.array(targets, dtype=np.intp)]
+    return bool((roots == roots[0]).all())
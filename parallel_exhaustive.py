@@ -0,0 +1,192 @@
+"""
+parallel_exhaustive.py
+
+Паралельний метод гілок і меж для повного перебору: простір розподілів
+ділиться за власниками перших клітинок (префіксом) на частини, які
+розв'язуються у пулі процесів. Процеси мають спільний рекорд
+(multiprocessing.Value), тож розв'язок, знайдений в одній частині, одразу
+посилює відсікання в інших.
+
+Частини впорядковані лексикографічно за префіксом, і рекорд зберігає пару
+(відхилення, номер частини) одним цілим ключем: рівний за відхиленням
+розв'язок відсікає лише пізніші частини. Тому знаходиться той самий
+(лексикографічно перший) оптимальний розподіл, що й у послідовному
+exhaustive_search.
+"""
+
+import multiprocessing
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional, Tuple, Union
+
+from exhaustive_search import (
+    NUM_OWNERS,
+    _branch_and_bound,
+    _global_lower_bound,
+    _greedy_upper_bound,
+)
+from grid import Grid, as_grid
+from results import ExhaustiveResult
+
+# Стан процесу-виконавця, переданий один раз під час ініціалізації
+_worker_cells: List[int] = []
+_worker_num_owners = NUM_OWNERS
+_worker_incumbent: Optional[Any] = None
+_worker_prefixes: List[Tuple[int, ...]] = []
+_worker_deadline: Optional[float] = None
+
+
+def _init_worker(
+    costs: bytes,
+    num_owners: int,
+    incumbent: Any,
+    prefixes: List[Tuple[int, ...]],
+    deadline: Optional[float] = None,
+) -> None:
+    """
+    Відновлює вартості клітинок, спільний рекорд та момент завершення
+    (time.perf_counter — монотонний годинник, спільний для процесів) у
+    процесі-виконавці.
+    """
+    global _worker_cells, _worker_num_owners
+    global _worker_incumbent, _worker_prefixes, _worker_deadline
+    buffer = array("i")
+    buffer.frombytes(costs)
+    _worker_cells = list(buffer)
+    _worker_num_owners = num_owners
+    _worker_incumbent = incumbent
+    _worker_prefixes = prefixes
+    _worker_deadline = deadline
+
+
+def _solve_shard(index: int) -> Optional[Tuple[int, List[int], List[int]]]:
+    """Розв'язує частину простору розподілів із префіксом номер index."""
+    return _branch_and_bound(
+        _worker_cells,
+        _worker_num_owners,
+        _worker_prefixes[index],
+        _worker_incumbent,
+        (index, len(_worker_prefixes)),
+        _worker_deadline,
+    )
+
+
+def shard_prefixes(
+    num_cells: int, num_owners: int, min_shards: int
+) -> List[Tuple[int, ...]]:
+    """
+    Повертає префікси частин у лексикографічному порядку.
+
+    Префікси канонічні, як і гілки методу гілок і меж: новий забудовник
+    з'являється лише наступним за номером. Довжина префікса зростає, доки
+    частин не стане щонайменше min_shards або префікс не охопить усі клітинки.
+    """
+    prefixes: List[Tuple[int, ...]] = [()]
+    while len(prefixes) < min_shards and len(prefixes[0]) < num_cells:
+        prefixes = [
+            prefix + (owner,)
+            for prefix in prefixes
+            for owner in range(min(max(prefix, default=-1) + 2, num_owners))
+        ]
+    return prefixes
+
+
+def exhaustive_search_parallel(
+    matrix: Union[Grid, List[List[int]]],
+    m: int,
+    n: int,
+    num_owners: int = NUM_OWNERS,
+    workers: Optional[int] = None,
+    shards_per_worker: int = 8,
+    time_budget_ms: Optional[float] = None,
+) -> ExhaustiveResult:
+    """
+    Знаходить оптимальний розподіл методом гілок і меж, розподіляючи частини
+    простору перебору між процесами.
+
+    Аргументи:
+        matrix: Матриця вартостей розміром m×n (Grid або список списків).
+        m: Кількість рядків у матриці.
+        n: Кількість стовпців у матриці.
+        num_owners: Кількість забудовників K (за замовчуванням 3).
+        workers: Кількість процесів (за замовчуванням — кількість ядер);
+            за workers == 1 частини розв'язуються у поточному процесі.
+        shards_per_worker: Скільки частин припадає на один процес; дрібніші
+            частини рівномірніше навантажують процеси.
+        time_budget_ms: Бюджет часу в мілісекундах на весь пошук; момент
+            завершення обчислюється один раз і передається всім процесам.
+            Після його вичерпання викидається TimeoutError, як і в
+            exhaustive_search. None — без обмеження.
+
+    Повертає:
+        Словник того ж вигляду, що й exhaustive_search.
+    """
+    if num_owners < 1:
+        raise ValueError("Кількість забудовників має бути додатною.")
+
+    start_time = time.time()
+    deadline = (
+        None if time_budget_ms is None else time.perf_counter() + time_budget_ms / 1000
+    )
+    grid = as_grid(matrix, m, n)
+    cells = list(grid.costs)
+    total = sum(cells)
+    lower_bound = _global_lower_bound(cells, total, num_owners)
+    workers = workers or os.cpu_count() or 1
+    prefixes = shard_prefixes(len(cells), num_owners, workers * shards_per_worker)
+    workers = min(workers, len(prefixes))
+
+    # Жадібний розв'язок не належить жодній частині: рівні йому гілки
+    # дозволені в усіх частинах, доки не знайдено власного розв'язку
+    num_shards = len(prefixes)
+    incumbent = multiprocessing.Value(
+        "q",
+        _greedy_upper_bound(cells, total, num_owners) * num_shards + num_shards - 1,
+    )
+    initargs = (grid.costs.tobytes(), num_owners, incumbent, prefixes, deadline)
+
+    results: List[Optional[Tuple[int, List[int], List[int]]]] = []
+    if workers == 1:
+        _init_worker(*initargs)
+        for index in range(num_shards):
+            results.append(_solve_shard(index))
+            if results[-1] is not None and results[-1][0] <= lower_bound:
+                break
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=initargs
+        ) as executor:
+            futures = [
+                executor.submit(_solve_shard, index) for index in range(num_shards)
+            ]
+            for index, future in enumerate(futures):
+                try:
+                    results.append(future.result())
+                except TimeoutError:
+                    # Решта частин завершилася б так само; ще не розпочаті
+                    # скасовуються, а розпочаті зупиняться за тим же моментом
+                    for pending in futures[index + 1 :]:
+                        pending.cancel()
+                    raise
+                # Досягнуто нижньої межі — наступні частини не можуть дати
+                # кращого чи лексикографічно ранішого розв'язку
+                if results[-1] is not None and results[-1][0] <= lower_bound:
+                    for pending in futures[index + 1 :]:
+                        pending.cancel()
+                    break
+
+    # Перша за порядком частина з найменшим відхиленням
+    _, assignment, best_total_costs = min(
+        (result for result in results if result is not None),
+        key=lambda result: result[0],
+    )
+    avg_cost = sum(best_total_costs) / num_owners
+
+    return {
+        "matrix": grid.to_matrix(assignment),
+        "total_costs": best_total_costs,
+        "max_deviation": max(abs(c - avg_cost) for c in best_total_costs),
+        "execution_time": time.time() - start_time,
+    }
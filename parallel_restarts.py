@@ -0,0 +1,141 @@
+"""
+parallel_restarts.py
+
+Багатостартовий режим наближеного алгоритму: K незалежних запусків із
+різними зернами генератора випадкових чисел виконуються у пулі процесів,
+а результатом є найкращий розподіл за максимальним відхиленням.
+"""
+
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from approximate_algorithm import approximate_algorithm
+from grid import Grid, as_grid
+from random_source import make_rng
+
+# Матриця вартостей, передана процесу-виконавцю один раз під час ініціалізації
+_worker_grid: Optional[Grid] = None
+
+
+def _init_worker(m: int, n: int, costs: bytes) -> None:
+    """Відновлює спільну матрицю вартостей у процесі-виконавці."""
+    global _worker_grid
+    buffer = array("i")
+    buffer.frombytes(costs)
+    _worker_grid = Grid(m, n, buffer)
+
+
+def _run_restart(
+    seed: int,
+    max_iterations: int,
+    stability_threshold: int,
+    local_search_type: str,
+    backend: str,
+    num_developers: int,
+    seeds: Optional[Sequence[Tuple[int, int]]],
+) -> Dict[str, Any]:
+    """Виконує один запуск наближеного алгоритму з заданим зерном."""
+    grid = _worker_grid
+    result = approximate_algorithm(
+        grid,
+        grid.m,
+        grid.n,
+        max_iterations=max_iterations,
+        stability_threshold=stability_threshold,
+        local_search_type=local_search_type,
+        backend=backend,
+        rng=seed,
+        num_developers=num_developers,
+        seeds=seeds,
+    )
+    result["seed"] = seed
+    return result
+
+
+def approximate_parallel_restarts(
+    matrix: Union[Grid, List[List[int]]],
+    m: int,
+    n: int,
+    max_iterations: int,
+    stability_threshold: int,
+    local_search_type: str,
+    restarts: int = 4,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    backend: str = "python",
+    num_developers: int = 4,
+    seeds: Optional[Sequence[Tuple[int, int]]] = None,
+) -> Dict[str, Any]:
+    """
+    Запускає наближений алгоритм restarts разів з різними зернами у пулі
+    процесів та повертає найкращий результат.
+
+    Аргументи:
+        matrix: Матриця вартостей розміром m×n (Grid або список списків).
+        m: Кількість рядків у матриці.
+        n: Кількість стовпців у матриці.
+        max_iterations: Максимальна кількість ітерацій кожного запуску.
+        stability_threshold: Поріг стабільності кожного запуску.
+        local_search_type: Тип локального пошуку ("1", "2" або "3").
+        restarts: Кількість незалежних запусків.
+        workers: Кількість процесів (за замовчуванням — кількість ядер).
+        seed: Базове зерно; з нього детерміновано виводяться зерна запусків.
+        backend: Реалізація повних проходів по матриці ("python" або "numpy").
+        num_developers: Кількість забудовників K.
+        seeds: Початкові клітинки (рядок, стовпець) забудовників 1..K
+            (за замовчуванням grid.default_seeds).
+
+    Повертає:
+        Словник найкращого запуску (ключі як у approximate_algorithm, плюс
+        'seed') з додатковими ключами:
+            'runs' → список статистик кожного запуску
+                (seed, max_dev, avg_dev, iterations, execution_time),
+            'restarts' → кількість запусків,
+            'execution_time' → загальний час виконання (у секундах).
+    """
+    start_time = time.time()
+
+    grid = as_grid(matrix, m, n)
+    seed_rng = make_rng(seed)
+    run_seeds = [seed_rng.randrange(2**32) for _ in range(restarts)]
+    workers = min(workers or os.cpu_count() or 1, restarts)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(grid.m, grid.n, grid.costs.tobytes()),
+    ) as executor:
+        futures = [
+            executor.submit(
+                _run_restart,
+                run_seed,
+                max_iterations,
+                stability_threshold,
+                local_search_type,
+                backend,
+                num_developers,
+                seeds,
+            )
+            for run_seed in run_seeds
+        ]
+        results = [future.result() for future in futures]
+
+    # За однакового відхилення перемагає запуск з меншим номером
+    best = min(results, key=lambda result: result["max_dev"])
+    best = dict(best)
+    best["runs"] = [
+        {
+            "seed": result["seed"],
+            "max_dev": result["max_dev"],
+            "avg_dev": result["avg_dev"],
+            "iterations": result["iterations"],
+            "execution_time": result["execution_time"],
+        }
+        for result in results
+    ]
+    best["restarts"] = restarts
+    best["execution_time"] = time.time() - start_time
+    return best
@@ -137,7 +137,10 @@ def plot_sizes_vs_times(
 
 
 def plot_sizes_vs_deviation(
-    sizes: list[int], greedy_devs: list[float], approx_devs: list[float]
+    sizes: list[int],
+    greedy_devs: list[float],
+    approx_devs: list[float],
+    exact_devs: list[float],
 ) -> None:
     """
     Побудова графіка залежності точності від розмірності задачі.
@@ -146,6 +149,8 @@ def plot_sizes_vs_deviation(
         sizes: Список розмірностей задачі.
         greedy_devs: Відхилення для жадібного алгоритму.
         approx_devs: Відхилення для наближеного алгоритму.
+        exact_devs: Різниця max - min точного розподілу сум між трьома
+            забудовниками без вимоги зв'язності (опорна крива).
     """
     if not os.path.exists(FOLDER):
         os.makedirs(FOLDER)
@@ -153,6 +158,12 @@ def plot_sizes_vs_deviation(
     plt.figure()
     plt.plot(sizes, greedy_devs, marker="o", label="Жадібний алгоритм")
     plt.plot(sizes, approx_devs, marker="x", label="Наближений алгоритм")
+    plt.plot(
+        sizes,
+        exact_devs,
+        marker="^",
+        label="Точний розподіл сум (3 забудовники, без зв'язності)",
+    )
     plt.xlabel("Розмірність задачі")
     plt.ylabel(LABEL_DEVIATION)
     plt.title("Точність від розмірності задачі")
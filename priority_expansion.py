@@ -0,0 +1,100 @@
+"""
+priority_expansion.py
+
+Модуль з пріоритетною стратегією етапу розширення територій. Замість
+почергового розширення з черги FIFO на кожному кроці розширюється
+забудовник з найменшими поточними витратами, а клітинка обирається з його
+фронту (вільних клітинок, суміжних з територією) у купі за ключем
+(шар, вартість): спершу найближчий до початкової клітинки шар фронту, а в
+ньому — найдешевша клітинка. Ключ лише за вартістю дає розгалужені
+території, які рано оточують одна одну, і дисбаланс після розширення
+зростає, а не зменшується.
+
+Забудовники впорядковані у купі за витратами, фронти — у купах із лінивим
+видаленням уже зайнятих клітинок, тож повне заповнення матриці виконується
+за O(m·n·log(m·n)).
+"""
+
+import heapq
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from cost_state import CostState
+from grid import Grid
+
+EXPANSION_STRATEGIES = ("fifo", "priority")
+
+
+class PriorityExpander:
+    """
+    Стан пріоритетного розширення.
+
+    Атрибути:
+        grid: Матриця вартостей.
+        owners: Плоский масив власників клітинок (змінюється на місці).
+        cost_state: Сумарні витрати забудовників (змінюються на місці).
+
+    Методи:
+        step(): Приєднує одну клітинку до території найбіднішого забудовника.
+    """
+
+    def __init__(self, grid: Grid, owners: array, cost_state: CostState):
+        self.grid = grid
+        self.owners = owners
+        self.cost_state = cost_state
+        self._frontiers: Dict[int, List[Tuple[int, int, int]]] = {
+            owner: [] for owner in range(1, cost_state.num_owners + 1)
+        }
+        for cell, owner in enumerate(owners):
+            if owner != 0:
+                self._push_free_neighbors(owner, cell, 0)
+        self._owner_heap = [
+            (cost_state[owner], owner)
+            for owner, frontier in self._frontiers.items()
+            if frontier
+        ]
+        heapq.heapify(self._owner_heap)
+
+    def _push_free_neighbors(self, owner: int, cell: int, layer: int) -> None:
+        """Додає вільних сусідів клітинки шару layer до фронту забудовника."""
+        owners = self.owners
+        costs = self.grid.costs
+        frontier = self._frontiers[owner]
+        for offset in self.grid.offsets(cell):
+            neighbor = cell + offset
+            if owners[neighbor] == 0:
+                heapq.heappush(frontier, (layer + 1, costs[neighbor], neighbor))
+
+    def _pop_free_cell(self, owner: int) -> Optional[Tuple[int, int, int]]:
+        """Повертає запис (шар, вартість, клітинка) вільної клітинки фронту."""
+        frontier = self._frontiers[owner]
+        owners = self.owners
+        while frontier:
+            entry = heapq.heappop(frontier)
+            if owners[entry[2]] == 0:
+                return entry
+        return None
+
+    def step(self) -> Optional[int]:
+        """
+        Приєднує до території забудовника з найменшими витратами найдешевшу
+        вільну клітинку найближчого шару його фронту.
+
+        Повертає:
+            Індекс приєднаної клітинки або None, якщо жоден забудовник
+            більше не може розширитися.
+        """
+        while self._owner_heap:
+            _, owner = heapq.heappop(self._owner_heap)
+            entry = self._pop_free_cell(owner)
+            if entry is None:
+                # Фронт вичерпано — забудовник більше не розширюється
+                continue
+
+            layer, cost, cell = entry
+            self.owners[cell] = owner
+            self.cost_state.add(owner, cost)
+            self._push_free_neighbors(owner, cell, layer)
+            heapq.heappush(self._owner_heap, (self.cost_state[owner], owner))
+            return cell
+        return None
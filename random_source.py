@@ -0,0 +1,59 @@
+"""
+random_source.py
+
+Модуль з єдиною точкою створення генераторів випадкових чисел. Алгоритми
+та генератори матриць приймають джерело випадковості явно (екземпляр
+random.Random, генератор NumPy або ціле зерно) і не використовують
+глобальний стан модуля random, тож запуски відтворювані й не впливають
+один на одного у паралельних процесах.
+"""
+
+import random
+from typing import Union
+
+import numpy as np
+
+RandomSource = Union[random.Random, np.random.Generator, int, None]
+
+
+class _NumpyRandom(random.Random):
+    """
+    Адаптер генератора NumPy до інтерфейсу random.Random.
+
+    Перевизначено лише базові методи random() та getrandbits(); решта
+    (choice, shuffle, randint, ...) успадковується від random.Random і
+    використовує їх, тож весь потік випадкових чисел іде від генератора NumPy.
+    """
+
+    def __init__(self, generator: np.random.Generator) -> None:
+        super().__init__()
+        self._generator = generator
+
+    def random(self) -> float:
+        return float(self._generator.random())
+
+    def getrandbits(self, k: int) -> int:
+        value = 0
+        for shift in range(0, k, 32):
+            bits = min(32, k - shift)
+            value |= int(self._generator.integers(0, 1 << bits)) << shift
+        return value
+
+
+def make_rng(source: RandomSource = None) -> random.Random:
+    """
+    Повертає генератор випадкових чисел для джерела source.
+
+    Аргументи:
+        source: Екземпляр random.Random (повертається без змін), генератор
+            numpy.random.Generator (обгортається адаптером), ціле зерно
+            (створюється новий random.Random(source)) або None (новий
+            генератор із зерном від операційної системи).
+    """
+    if isinstance(source, random.Random):
+        return source
+    if isinstance(source, np.random.Generator):
+        return _NumpyRandom(source)
+    if source is None or isinstance(source, int):
+        return random.Random(source)
+    raise TypeError(f"Непідтримуване джерело випадковості: {type(source).__name__}")
@@ -0,0 +1,62 @@
+"""
+reporting.py
+
+Шар форматування звітів. Алгоритми не виконують введення-виведення й лише
+повертають структуровані результати; текстовий звіт для консолі чи
+лог-файлу формується тут і лише на вимогу (наприклад, у main.solve_task).
+"""
+
+from typing import List
+
+from results import ApproximateResult, ExhaustiveResult, GreedyResult
+
+
+def format_assignment(matrix: List[List[int]]) -> str:
+    """Форматує матрицю розподілу по одному рядку на рядок матриці."""
+    return "\n".join(" ".join(str(cell) for cell in row) for row in matrix)
+
+
+def format_greedy_result(result: GreedyResult) -> str:
+    """Формує звіт жадібного алгоритму."""
+    return "\n".join(
+        [
+            "\n=== Жадібний алгоритм ===",
+            "\nМатриця розподілу:",
+            format_assignment(result["matrix"]),
+            f"\nКількість ітерацій: {result['iterations']}",
+            f"Час виконання: {result['execution_time']:.4f} секунд",
+            f"Загальна вартість для кожного забудовника: {result['total_costs']}",
+            f"Якість рішення (макс. відхилення): {result['max_dev']}",
+        ]
+    )
+
+
+def format_approximate_result(result: ApproximateResult) -> str:
+    """Формує звіт наближеного двоетапного алгоритму."""
+    return "\n".join(
+        [
+            "\n=== Наближений двоетапний алгоритм ===",
+            "\nМатриця розподілу:",
+            format_assignment(result["matrix"]),
+            f"\nКількість ітерацій (розширення): {result['expansion_iterations']}",
+            f"Кількість ітерацій (оптимізація): {result['optimization_iterations']}",
+            f"Загальна кількість ітерацій: {result['iterations']}",
+            f"Час виконання: {result['execution_time']:.4f} секунд",
+            f"Загальна вартість для кожного забудовника: {result['total_costs']}",
+            "Якість рішень (відхилення від середньої цільової вартості): "
+            f"{result['max_dev']}",
+        ]
+    )
+
+
+def format_exhaustive_result(result: ExhaustiveResult) -> str:
+    """Формує звіт повного перебору."""
+    return "\n".join(
+        [
+            "Матриця розподілу:",
+            format_assignment(result["matrix"]),
+            f"Час виконання: {result['execution_time']:.4f} секунд",
+            f"Загальна вартість для кожного забудовника: {result['total_costs']}",
+            f"Максимальне відхилення: {result['max_deviation']}",
+        ]
+    )
@@ -0,0 +1,52 @@
+"""
+results.py
+
+Структуровані типи результатів алгоритмів. Алгоритми повертають звичайні
+словники, а ці типи описують їхні ключі для перевірки типів та для шару
+форматування звітів (reporting.py).
+"""
+
+from typing import Dict, List, TypedDict, Union
+
+
+class GreedyResult(TypedDict):
+    """Результат жадібного алгоритму (greedy_algorithm)."""
+
+    matrix: List[List[int]]
+    total_costs: Dict[int, int]
+    execution_time: float
+    iterations: int
+    max_dev: Union[int, float]
+
+
+class ApproximateResult(TypedDict):
+    """Результат наближеного двоетапного алгоритму (approximate_algorithm)."""
+
+    matrix: List[List[int]]
+    total_costs: Dict[int, int]
+    execution_time: float
+    iterations: int
+    expansion_iterations: int
+    optimization_iterations: int
+    avg_dev: float
+    max_dev: int
+
+
+class SessionResult(TypedDict):
+    """Поточний стан сеансу інкрементного розподілу (SolverSession)."""
+
+    matrix: List[List[int]]
+    total_costs: Dict[int, int]
+    avg_dev: float
+    max_dev: int
+    updates: int
+    repair_moves: int
+
+
+class ExhaustiveResult(TypedDict):
+    """Результат повного перебору та точного розв'язувача (exhaustive_search)."""
+
+    matrix: List[List[int]]
+    total_costs: List[int]
+    max_deviation: float
+    execution_time: float
@@ -0,0 +1,260 @@
+"""
+solution_cache.py
+
+Кеш результатів алгоритмів. Задача симетрична відносно групи симетрій
+прямокутника (повороти та відображення матриці), тож ключем кешу є
+канонічна форма матриці — найменша з восьми перетворених — разом із
+назвою алгоритму та його параметрами. Для жадібного та наближеного
+алгоритмів до ключа додаються початкові клітинки забудовників, перетворені
+разом з матрицею.
+
+Збережений результат повертається у вигляді, перетвореному назад до
+орієнтації матриці, з якою звернулися до кешу. Кеш у пам'яті обмежений за
+розміром і витісняє найдавніше використані записи (LRU); за бажанням
+записи зберігаються також на диску (shelve).
+"""
+
+import copy
+import hashlib
+import json
+import shelve
+from array import array
+from collections import OrderedDict
+from itertools import chain
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from grid import Grid, default_seeds
+
+# Перетворення матриці: (відображення рядків, відображення стовпців,
+# транспонування), що застосовуються саме в такому порядку
+Transform = Tuple[bool, bool, bool]
+TRANSFORMS: Tuple[Transform, ...] = tuple(
+    (flip_rows, flip_cols, transpose)
+    for transpose in (False, True)
+    for flip_rows in (False, True)
+    for flip_cols in (False, True)
+)
+
+# Алгоритми, у яких забудовник k починає з початкової клітинки seeds[k - 1]
+SEEDED_SOLVERS = ("greedy", "approximate")
+
+
+def transform_rows(rows: Sequence[Sequence[Any]], transform: Transform) -> List[Any]:
+    """Застосовує перетворення до матриці, заданої списком рядків."""
+    flip_rows, flip_cols, transpose = transform
+    result = list(rows[::-1] if flip_rows else rows)
+    if flip_cols:
+        result = [row[::-1] for row in result]
+    if transpose:
+        result = [list(column) for column in zip(*result)]
+    return result
+
+
+def inverse_transform_rows(
+    rows: Sequence[Sequence[Any]], transform: Transform
+) -> List[Any]:
+    """Скасовує перетворення transform для матриці, заданої списком рядків."""
+    flip_rows, flip_cols, transpose = transform
+    result = [list(column) for column in zip(*rows)] if transpose else list(rows)
+    if flip_cols:
+        result = [row[::-1] for row in result]
+    return result[::-1] if flip_rows else result
+
+
+def transform_cell(
+    i: int, j: int, m: int, n: int, transform: Transform
+) -> Tuple[int, int]:
+    """Повертає координати клітинки (i, j) матриці m×n після перетворення."""
+    flip_rows, flip_cols, transpose = transform
+    if flip_rows:
+        i = m - 1 - i
+    if flip_cols:
+        j = n - 1 - j
+    return (j, i) if transpose else (i, j)
+
+
+def canonical_form(grid: Grid) -> Tuple[Transform, int, int, bytes]:
+    """
+    Знаходить канонічну форму матриці: лексикографічно найменшу серед
+    восьми перетворених за (рядки, стовпці, вартості).
+
+    Повертає:
+        Кортеж (перетворення, m, n, вартості канонічної форми у байтах).
+    """
+    rows = [grid.costs[i * grid.n : (i + 1) * grid.n] for i in range(grid.m)]
+    best = None
+    for transform in TRANSFORMS:
+        transformed = transform_rows(rows, transform)
+        m = len(transformed)
+        n = len(transformed[0]) if m else 0
+        costs = array("i", chain.from_iterable(transformed))
+        candidate = (m, n, costs)
+        if best is None or candidate < best[1:]:
+            best = (transform, m, n, costs)
+    transform, m, n, costs = best
+    return transform, m, n, costs.tobytes()
+
+
+class SolutionCache:
+    """
+    Кеш результатів алгоритмів з ключем за канонічною формою матриці.
+
+    Аргументи:
+        max_entries: Найбільша кількість записів у пам'яті (LRU).
+        path: Шлях до файлу shelve для збереження записів на диску
+            (None — лише в пам'яті).
+
+    Атрибути:
+        hits: Кількість звернень, знайдених у кеші.
+        misses: Кількість звернень, для яких алгоритм було запущено.
+
+    Методи:
+        solve(name, solver, grid, **params): Повертає результат із кешу або
+            запускає solver(grid, m, n, **params) і зберігає результат.
+        clear(): Очищає кеш у пам'яті та на диску.
+        close(): Закриває файл кешу на диску.
+    """
+
+    def __init__(self, max_entries: int = 128, path: Optional[str] = None):
+        if max_entries < 1:
+            raise ValueError("Розмір кешу має бути додатним.")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._store = shelve.open(path) if path is not None else None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _seed_cells(
+        self, name: str, grid: Grid, params: Dict[str, Any]
+    ) -> Optional[List[Tuple[int, int]]]:
+        """Початкові клітинки забудовників у координатах матриці grid."""
+        if name not in SEEDED_SOLVERS:
+            return None
+        seeds = params.get("seeds")
+        if seeds is None:
+            seeds = default_seeds(grid.m, grid.n, params.get("num_developers", 4))
+        return [tuple(seed) for seed in seeds]
+
+    def _key(
+        self,
+        name: str,
+        grid: Grid,
+        params: Dict[str, Any],
+        seeds: Optional[List[Tuple[int, int]]],
+    ) -> Tuple[str, Transform]:
+        """Обчислює ключ кешу та перетворення до канонічної форми."""
+        transform, m, n, costs = canonical_form(grid)
+        key_params = {k: v for k, v in params.items() if k != "seeds"}
+        if seeds is not None:
+            # Номери забудовників відновлюються за початковими клітинками,
+            # тож у ключі важлива лише множина клітинок
+            key_params["seeds"] = sorted(
+                transform_cell(i, j, grid.m, grid.n, transform) for i, j in seeds
+            )
+        digest = hashlib.sha256()
+        digest.update(
+            json.dumps([name, m, n, key_params], sort_keys=True, default=repr).encode()
+        )
+        digest.update(costs)
+        return digest.hexdigest(), transform
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Шукає запис у пам'яті, а потім на диску."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+        if self._store is not None and key in self._store:
+            entry = self._store[key]
+            self._remember(key, entry)
+            return entry
+        return None
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        """Додає запис у пам'ять, витісняючи найдавніше використаний."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def solve(
+        self,
+        name: str,
+        solver: Callable[..., Dict[str, Any]],
+        grid: Grid,
+        **params: Any,
+    ) -> Dict[str, Any]:
+        """
+        Повертає результат алгоритму name для матриці grid.
+
+        Якщо результат для цієї матриці (з точністю до симетрії) та тих самих
+        параметрів уже є в кеші, його матриця розподілу перетворюється до
+        орієнтації grid, а номери забудовників відновлюються за їхніми
+        початковими клітинками. Інакше запускається
+        solver(grid, grid.m, grid.n, **params).
+
+        Запуски з генератором випадкових чисел, переданим об'єктом (а не
+        цілим зерном чи None), не кешуються.
+        """
+        rng = params.get("rng")
+        if rng is not None and not isinstance(rng, int):
+            return solver(grid, grid.m, grid.n, **params)
+
+        seeds = self._seed_cells(name, grid, params)
+        key, transform = self._key(name, grid, params, seeds)
+        entry = self._lookup(key)
+        if entry is None:
+            self.misses += 1
+            result = solver(grid, grid.m, grid.n, **params)
+            entry = copy.deepcopy(result)
+            entry["matrix"] = transform_rows(result["matrix"], transform)
+            self._remember(key, entry)
+            if self._store is not None:
+                self._store[key] = entry
+            return result
+
+        self.hits += 1
+        result = copy.deepcopy(entry)
+        result["matrix"] = inverse_transform_rows(entry["matrix"], transform)
+        if seeds is not None:
+            _relabel(result, seeds)
+        return result
+
+    def clear(self) -> None:
+        """Очищає кеш у пам'яті та на диску."""
+        self._entries.clear()
+        if self._store is not None:
+            self._store.clear()
+
+    def close(self) -> None:
+        """Закриває файл кешу на диску."""
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+
+def _relabel(result: Dict[str, Any], seeds: List[Tuple[int, int]]) -> None:
+    """
+    Перенумеровує забудовників так, щоб забудовник k володів початковою
+    клітинкою seeds[k - 1]. Якщо початкові клітинки належать не різним
+    забудовникам (їх передано під час оптимізації) або якась із них нічия,
+    номери не змінюються. Нічийні клітинки (0) залишаються нічийними.
+    """
+    matrix = result["matrix"]
+    mapping = {matrix[i][j]: k for k, (i, j) in enumerate(seeds, start=1)}
+    if (
+        0 in mapping
+        or len(mapping) != len(seeds)
+        or set(mapping) != set(mapping.values())
+    ):
+        return
+    result["matrix"] = [[mapping.get(owner, owner) for owner in row] for row in matrix]
+    result["total_costs"] = dict(
+        sorted(
+            (mapping.get(owner, owner), cost)
+            for owner, cost in result["total_costs"].items()
+        )
+    )
@@ -0,0 +1,328 @@
+"""
+solver_session.py
+
+Модуль з довготривалим сеансом розподілу для потоку змін вартостей
+клітинок. Сеанс один раз розв'язує задачу жадібним або наближеним
+алгоритмом (нічийні клітинки, які той залишив, добираються пріоритетним
+розширенням), а далі зберігає матрицю вартостей, масив власників, сумарні
+витрати забудовників (CostState) та множини межових клітинок кожного
+забудовника. Зміна вартості клітинки оновлює витрати її власника за O(1),
+після чого виконується обмежене локальне відновлення: перенесення межових
+клітинок тим самим ходом, що й в етапі оптимізації наближеного алгоритму
+(_try_local_improvement). Переглядаються лише межі забудовників з
+найбільшими та найменшими витратами; уся матриця повторно не проходиться.
+"""
+
+from array import array
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from approximate_algorithm import (
+    BACKENDS,
+    _find_border_cells,
+    _is_border_cell,
+    _try_local_improvement,
+    approximate_algorithm,
+)
+from cost_state import CostState
+from greedy_algorithm import greedy_algorithm
+from grid import Grid, as_grid
+from priority_expansion import PriorityExpander
+from random_source import RandomSource, make_rng
+import numpy_backend
+from results import SessionResult
+
+SESSION_SOLVERS = ("greedy", "approximate")
+
+
+class SolverSession:
+    """
+    Сеанс розподілу з інкрементним оновленням вартостей клітинок.
+
+    Аргументи:
+        matrix: Матриця вартостей розміром m×n (Grid або список списків);
+            сеанс працює з власною копією вартостей.
+        m: Кількість рядків у матриці.
+        n: Кількість стовпців у матриці.
+        solver: Алгоритм початкового розв'язку: "greedy" або "approximate".
+        max_iterations, stability_threshold, local_search_type: Параметри
+            початкового розв'язку (як у greedy_algorithm/approximate_algorithm).
+        backend: Реалізація повних проходів і перевірок зв'язності
+            ("python" або "numpy"); для наближеного алгоритму передається й
+            у початковий розв'язок.
+        rng: Джерело випадковості для початкового розв'язку та порядку
+            перегляду клітинок під час відновлення.
+        num_developers: Кількість забудовників K.
+        seeds: Початкові клітинки забудовників (див. grid.default_seeds).
+        max_repair_moves: Найбільша кількість перенесень клітинок за одне
+            відновлення після пакета змін.
+
+    Атрибути:
+        grid: Поточна матриця вартостей.
+        owners: Плоский масив власників клітинок.
+        cost_state: Сумарні витрати забудовників.
+        borders: Для кожного забудовника — множина його межових клітинок.
+        updates: Кількість застосованих змін вартостей.
+        repair_moves: Загальна кількість перенесень клітинок під час відновлень.
+
+    Методи:
+        update_cell(i, j, new_cost): Змінює вартість однієї клітинки.
+        update_cells(updates): Змінює вартості пакета клітинок.
+        result(): Поточний розподіл у вигляді словника результату.
+    """
+
+    def __init__(
+        self,
+        matrix: Union[Grid, List[List[int]]],
+        m: int,
+        n: int,
+        solver: str = "approximate",
+        max_iterations: int = 1000,
+        stability_threshold: int = 50,
+        local_search_type: str = "1",
+        backend: str = "python",
+        rng: RandomSource = None,
+        num_developers: int = 4,
+        seeds: Optional[Sequence[Tuple[int, int]]] = None,
+        max_repair_moves: int = 64,
+    ):
+        if solver not in SESSION_SOLVERS:
+            raise ValueError(f"Невідомий алгоритм сеансу: {solver}")
+        if backend not in BACKENDS:
+            raise ValueError(f"Невідомий backend: {backend}")
+        if max_repair_moves < 0:
+            raise ValueError("Кількість перенесень має бути невід'ємною.")
+
+        source = as_grid(matrix, m, n)
+        self.grid = Grid(source.m, source.n, array("i", source.costs))
+        self.backend = backend
+        self.max_repair_moves = max_repair_moves
+        self.rng = make_rng(rng)
+        self.updates = 0
+        self.repair_moves = 0
+
+        params = {
+            "max_iterations": max_iterations,
+            "stability_threshold": stability_threshold,
+            "local_search_type": local_search_type,
+            "rng": self.rng,
+            "num_developers": num_developers,
+            "seeds": seeds,
+        }
+        if solver == "approximate":
+            initial = approximate_algorithm(
+                self.grid, self.grid.m, self.grid.n, backend=backend, **params
+            )
+        else:
+            initial = greedy_algorithm(self.grid, self.grid.m, self.grid.n, **params)
+
+        self.owners = self.grid.new_owners()
+        self.cost_state = CostState(num_developers)
+        costs = self.grid.costs
+        cell = 0
+        for row in initial["matrix"]:
+            for owner in row:
+                self.owners[cell] = owner
+                if owner != 0:
+                    self.cost_state.add(owner, costs[cell])
+                cell += 1
+
+        self._release_detached_components()
+
+        # Обидва алгоритми можуть залишити нічийні клітинки (розширення
+        # обмежене ітераціями), які розділяють території й не дають
+        # переносити клітинки між ними; їх добирає пріоритетне розширення.
+        # Воно приєднує лише клітинки, суміжні з територією, тож зв'язні
+        # території залишаються зв'язними
+        if 0 in self.owners:
+            expander = PriorityExpander(self.grid, self.owners, self.cost_state)
+            while expander.step() is not None:
+                pass
+
+        find_border_cells = (
+            numpy_backend.find_border_cells
+            if backend == "numpy"
+            else _find_border_cells
+        )
+        self.borders: Dict[int, Set[int]] = {
+            owner: set() for owner in range(1, num_developers + 1)
+        }
+        for cell, owner in find_border_cells(self.grid, self.owners):
+            self.borders[owner].add(cell)
+
+        # Дозаповнений розподіл ще не є локальним оптимумом: один раз
+        # доводимо до нього всі території, щоб далі відновлення після
+        # зміни торкалося лише її наслідків
+        self._repair(len(self.owners))
+
+    def update_cell(self, i: int, j: int, new_cost: int) -> int:
+        """
+        Змінює вартість клітинки (i, j) і відновлює розподіл.
+
+        Повертає:
+            Максимальне відхилення витрат після відновлення.
+        """
+        return self.update_cells([(i, j, new_cost)])
+
+    def update_cells(self, updates: Iterable[Tuple[int, int, int]]) -> int:
+        """
+        Застосовує пакет змін (рядок, стовпець, нова вартість) і, якщо
+        витрати забудовників змінилися, один раз відновлює розподіл.
+
+        Витрати власника кожної клітинки змінюються на різницю вартостей
+        за O(1); якщо клітинка трапляється в пакеті кілька разів, діє
+        остання зміна.
+
+        Викидає:
+            ValueError: Якщо клітинка лежить поза матрицею. Зміни пакета,
+                застосовані до неї, залишаються в силі.
+
+        Повертає:
+            Максимальне відхилення витрат після відновлення.
+        """
+        grid = self.grid
+        costs = grid.costs
+        changed = False
+        for i, j, new_cost in updates:
+            if not (0 <= i < grid.m and 0 <= j < grid.n):
+                raise ValueError(f"Клітинка ({i}, {j}) поза межами матриці.")
+            cell = i * grid.n + j
+            owner = self.owners[cell]
+            delta = new_cost - costs[cell]
+            costs[cell] = new_cost
+            self.updates += 1
+            if owner != 0 and delta:
+                self.cost_state.add(owner, delta)
+                changed = True
+
+        if changed:
+            self.repair_moves += self._repair(self.max_repair_moves)
+        return self.cost_state.max_dev()
+
+    def _release_detached_components(self) -> None:
+        """
+        Залишає кожному забудовнику лише найбільшу компоненту зв'язності
+        його території, а решту клітинок робить нічийними (їх далі добирає
+        розширення).
+
+        Жадібний алгоритм не підтримує зв'язність територій, а перевірка
+        перенесення (_removal_keeps_connectivity) її передбачає: для
+        розірваної території вона дозволила б перенесення, що розриває її
+        ще більше, і не розпізнала б покращень.
+        """
+        owners = self.owners
+        costs = self.grid.costs
+        components: Dict[int, List[List[int]]] = {}
+        visited = bytearray(len(owners))
+        for start, owner in enumerate(owners):
+            if owner == 0 or visited[start]:
+                continue
+            visited[start] = 1
+            component = [start]
+            queue = deque([start])
+            while queue:
+                cell = queue.popleft()
+                for offset in self.grid.offsets(cell):
+                    neighbor = cell + offset
+                    if not visited[neighbor] and owners[neighbor] == owner:
+                        visited[neighbor] = 1
+                        component.append(neighbor)
+                        queue.append(neighbor)
+            components.setdefault(owner, []).append(component)
+
+        for owner, parts in components.items():
+            largest = max(parts, key=len)
+            for part in parts:
+                if part is largest:
+                    continue
+                for cell in part:
+                    owners[cell] = 0
+                    self.cost_state.add(owner, -costs[cell])
+
+    def _refresh_border(self, cell: int, old_owner: int) -> None:
+        """Оновлює належність клітинки до множини меж її власника."""
+        owner = self.owners[cell]
+        if old_owner != owner and old_owner != 0:
+            self.borders[old_owner].discard(cell)
+        if owner == 0:
+            return
+        if _is_border_cell(self.grid, self.owners, cell):
+            self.borders[owner].add(cell)
+        else:
+            self.borders[owner].discard(cell)
+
+    def _update_borders_around(self, cell: int, old_owner: int) -> None:
+        """
+        Оновлює множини меж після перенесення клітинки від old_owner:
+        змінитися може лише стан самої клітинки та її сусідів.
+        """
+        self._refresh_border(cell, old_owner)
+        owners = self.owners
+        for offset in self.grid.offsets(cell):
+            neighbor = cell + offset
+            self._refresh_border(neighbor, owners[neighbor])
+
+    def _repair_candidates(self) -> List[int]:
+        """
+        Клітинки, перенесення яких може строго зменшити максимальне
+        відхилення: межові клітинки забудовника з найбільшими витратами та
+        сусідні з територією забудовника з найменшими витратами клітинки
+        інших забудовників. Будь-яке інше перенесення не зменшує ні
+        максимум, ні мінімум витрат, тож переглядаються лише межі цих двох
+        забудовників, хоч би чиї витрати змінилися.
+        """
+        owners = self.owners
+        cost_state = self.cost_state
+        developers = range(1, cost_state.num_owners + 1)
+        highest = max(developers, key=cost_state.__getitem__)
+        lowest = min(developers, key=cost_state.__getitem__)
+
+        candidates = set(self.borders[highest])
+        for cell in self.borders[lowest]:
+            for offset in self.grid.offsets(cell):
+                if owners[cell + offset] not in (0, lowest):
+                    candidates.add(cell + offset)
+        return list(candidates)
+
+    def _repair(self, max_moves: int) -> int:
+        """
+        Обмежене локальне відновлення: поки можливо і не вичерпано
+        max_moves, переносить одну клітинку, що строго зменшує максимальне
+        відхилення.
+
+        Повертає:
+            Кількість виконаних перенесень.
+        """
+        grid = self.grid
+        owners = self.owners
+        moves = 0
+        while moves < max_moves:
+            candidates = self._repair_candidates()
+            self.rng.shuffle(candidates)
+
+            moved = None
+            for cell in candidates:
+                owner = owners[cell]
+                if _try_local_improvement(
+                    grid, owners, self.cost_state, cell, owner, self.backend
+                ):
+                    moved = cell
+                    break
+
+            if moved is None:
+                # Локальний оптимум
+                break
+            self._update_borders_around(moved, owner)
+            moves += 1
+        return moves
+
+    def result(self) -> SessionResult:
+        """Повертає поточний розподіл і витрати забудовників."""
+        return {
+            "matrix": self.grid.to_matrix(self.owners),
+            "total_costs": self.cost_state.as_dict(),
+            "avg_dev": self.cost_state.stddev(),
+            "max_dev": self.cost_state.max_dev(),
+            "updates": self.updates,
+            "repair_moves": self.repair_moves,
+        }
@@ -0,0 +1,166 @@
+"""
+swap_index.py
+
+Модуль з індексом кандидатів на обмін клітинками між сусідніми
+забудовниками. Для кожної пари (забудовник, сусідній забудовник) індекс
+зберігає відсортований за вартістю список клітинок забудовника, що
+прилягають до сусіда, тож клітинку з вартістю, найближчою до потрібної,
+можна знайти двійковим пошуком за O(log n) замість перебору всіх пар.
+
+Обмін двома клітинками дозволяє покращити розподіл, коли різниця витрат
+забудовників менша за вартість будь-якої окремої клітинки й передача однієї
+клітинки вже нічого не дає.
+"""
+
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Tuple
+
+from cost_state import CostState
+from grid import Grid
+
+
+class SwapCandidateIndex:
+    """
+    Відсортовані за вартістю межові клітинки для кожної пари забудовників.
+
+    Ключ (owner, other) відповідає списку пар (вартість, клітинка) клітинок
+    забудовника owner, що мають сусіда по стороні з забудовником other.
+    Індекс оновлюється локально після кожного перепризначення клітинки.
+
+    Методи:
+        update_around(cell): Оновлює стан клітинки та її сусідів.
+        rebuild(): Повністю перебудовує індекс проходом по матриці.
+        closest(owner, other, target, count): Клітинки з вартістю,
+            найближчою до target.
+    """
+
+    def __init__(self, grid: Grid, owners: array):
+        self.grid = grid
+        self.owners = owners
+        self._lists: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        # Ключі, під якими клітинка зараз записана в індексі
+        self._memberships: Dict[int, Tuple[Tuple[int, int], ...]] = {}
+
+    def _keys(self, cell: int) -> Tuple[Tuple[int, int], ...]:
+        """Повертає ключі (owner, other), яким має належати клітинка."""
+        owners = self.owners
+        owner = owners[cell]
+        if owner == 0:
+            return ()
+        others = set()
+        for offset in self.grid.offsets(cell):
+            other = owners[cell + offset]
+            if other != 0 and other != owner:
+                others.add(other)
+        return tuple((owner, other) for other in sorted(others))
+
+    def _refresh(self, cell: int) -> None:
+        """Приводить записи клітинки у відповідність до поточного розподілу."""
+        keys = self._keys(cell)
+        old_keys = self._memberships.get(cell, ())
+        if keys == old_keys:
+            return
+
+        entry = (self.grid.costs[cell], cell)
+        for key in old_keys:
+            if key not in keys:
+                items = self._lists[key]
+                del items[bisect_left(items, entry)]
+        for key in keys:
+            if key not in old_keys:
+                insort(self._lists.setdefault(key, []), entry)
+
+        if keys:
+            self._memberships[cell] = keys
+        else:
+            self._memberships.pop(cell, None)
+
+    def update_around(self, cell: int) -> None:
+        """
+        Оновлює індекс після зміни власника клітинки.
+
+        Змінитися може лише стан самої клітинки та її чотирьох сусідів.
+        """
+        self._refresh(cell)
+        for offset in self.grid.offsets(cell):
+            self._refresh(cell + offset)
+
+    def rebuild(self) -> None:
+        """Повністю перебудовує індекс за поточним розподілом."""
+        self._lists.clear()
+        self._memberships.clear()
+        costs = self.grid.costs
+        for cell in range(len(self.owners)):
+            keys = self._keys(cell)
+            if keys:
+                self._memberships[cell] = keys
+                for key in keys:
+                    self._lists.setdefault(key, []).append((costs[cell], cell))
+        for items in self._lists.values():
+            items.sort()
+
+    def closest(
+        self, owner: int, other: int, target: float, count: int = 2
+    ) -> List[int]:
+        """
+        Повертає до count клітинок забудовника owner, що прилягають до other,
+        з вартістю, найближчою до target (спершу найближчі).
+        """
+        items = self._lists.get((owner, other))
+        if not items:
+            return []
+
+        pos = bisect_left(items, (target, -1))
+        left, right = pos - 1, pos
+        found: List[int] = []
+        while len(found) < count and (left >= 0 or right < len(items)):
+            take_right = left < 0 or (
+                right < len(items)
+                and items[right][0] - target <= target - items[left][0]
+            )
+            if take_right:
+                found.append(items[right][1])
+                right += 1
+            else:
+                found.append(items[left][1])
+                left -= 1
+        return found
+
+
+def improving_swaps(
+    index: SwapCandidateIndex,
+    cost_state: CostState,
+    cell: int,
+    others: Iterable[int],
+    count: int = 2,
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Знаходить обміни клітинки cell з клітинками сусідніх забудовників others,
+    що зменшують максимальне відхилення.
+
+    Для пари забудовників (owner, other) найкраще, коли різниця вартостей
+    клітинок, якими вони обмінюються, дорівнює половині різниці їхніх витрат,
+    тож партнер шукається в індексі за вартістю, найближчою до
+    cost - (витрати owner - витрати other) / 2.
+
+    Повертає:
+        Список (нове max_dev, клітинка-партнер, other, сума, що переходить
+        від owner до other), упорядкований від найкращого обміну.
+    """
+    costs = index.grid.costs
+    owner = index.owners[cell]
+    cost = costs[cell]
+    current_max_dev = cost_state.max_dev()
+    swaps = []
+    for other in others:
+        target = cost - (cost_state[owner] - cost_state[other]) / 2
+        for partner in index.closest(other, owner, target, count):
+            amount = cost - costs[partner]
+            if amount == 0:
+                continue
+            new_max_dev = cost_state.max_dev_after_transfer(owner, other, amount)
+            if new_max_dev < current_max_dev:
+                swaps.append((new_max_dev, partner, other, amount))
+    swaps.sort()
+    return swaps